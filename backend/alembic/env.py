@@ -12,7 +12,6 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 from app.config.database import Base  # noqa: E402
 from app.config import get_settings  # noqa: E402
-import app.infrastructure.database.models  # noqa: F401,E402  # ensure models are imported
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -25,18 +24,18 @@ if config.config_file_name is not None:
 
 settings = get_settings()
 
-# Derive a sync URL for Alembic if app uses asyncpg
-db_url = settings.database_url
-if "+asyncpg" in db_url:
-    db_url = db_url.replace("+asyncpg", "+psycopg2")
-
-# overwrite sqlalchemy.url with derived sync url
-config.set_main_option("sqlalchemy.url", db_url)
+# psycopg (v3) serves both the async app engine and sync migrations,
+# so Alembic uses the application URL as-is
+config.set_main_option("sqlalchemy.url", settings.database_url)
 
+# Models register their tables on Base.metadata when imported; that import is
+# deferred to the run_* functions below
 target_metadata = Base.metadata
 
 
 def run_migrations_offline() -> None:
+    import app.infrastructure.database.models  # noqa: F401  # ensure models are imported
+
     url = config.get_main_option("sqlalchemy.url")
     context.configure(url=url, target_metadata=target_metadata, literal_binds=True)
 
@@ -45,10 +44,14 @@ def run_migrations_offline() -> None:
 
 
 def run_migrations_online() -> None:
+    import app.infrastructure.database.models  # noqa: F401  # ensure models are imported
+
     connectable = engine_from_config(
         config.get_section(config.config_ini_section, {}),
         prefix="sqlalchemy.",
         poolclass=pool.NullPool,
+        # One-shot DDL run; psycopg's server-side prepared statements never pay off
+        connect_args={"prepare_threshold": None},
     )
 
     with connectable.connect() as connection:
@@ -0,0 +1,40 @@
+"""key checksum index on size
+
+Revision ID: 169e06d5b459
+Revises: 5f5377dc1fdc
+Create Date: 2026-10-15 23:41:08.512377
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '169e06d5b459'
+down_revision = '5f5377dc1fdc'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        # Size leads so the "any file of this size?" probe runs before hashing
+        # and the dedup lookup narrows on size first.
+        op.create_index(
+            'idx_nodes_user_size_checksum', 'nodes', ['user_id', 'size_bytes', 'checksum'],
+            unique=False,
+            postgresql_concurrently=True,
+            postgresql_where=sa.text('checksum IS NOT NULL AND deleted_at IS NULL'),
+        )
+        op.drop_index('idx_nodes_user_checksum', table_name='nodes', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_nodes_user_checksum', 'nodes', ['user_id', 'checksum'],
+            unique=False,
+            postgresql_concurrently=True,
+            postgresql_where=sa.text('checksum IS NOT NULL AND deleted_at IS NULL'),
+            postgresql_include=['id', 'size_bytes'],
+        )
+        op.drop_index('idx_nodes_user_size_checksum', table_name='nodes', postgresql_concurrently=True)
@@ -0,0 +1,32 @@
+"""unique live folder path
+
+Revision ID: 25226f5727ec
+Revises: 169e06d5b459
+Create Date: 2026-10-16 10:12:44.207913
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '25226f5727ec'
+down_revision = '169e06d5b459'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        # Arbiter for ensure_directory_path's INSERT ... ON CONFLICT DO NOTHING;
+        # also stops concurrent uploads from creating the same folder twice.
+        op.create_index(
+            'uq_nodes_user_folder_path_live', 'nodes', ['user_id', 'path'],
+            unique=True,
+            postgresql_concurrently=True,
+            postgresql_where=sa.text("kind = 'folder' AND deleted_at IS NULL"),
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('uq_nodes_user_folder_path_live', table_name='nodes', postgresql_concurrently=True)
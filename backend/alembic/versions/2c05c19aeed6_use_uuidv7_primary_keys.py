@@ -0,0 +1,47 @@
+"""use uuidv7 primary keys
+
+Revision ID: 2c05c19aeed6
+Revises: 9421a3542d9c
+Create Date: 2026-10-15 23:05:51.772930
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '2c05c19aeed6'
+down_revision = '9421a3542d9c'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Time-ordered UUIDs keep inserts at the right edge of the id indexes
+    # instead of scattering them across random leaf pages like UUIDv4.
+    # 48-bit unix milliseconds followed by random bits, version 7.
+    op.execute("""
+        CREATE OR REPLACE FUNCTION uuidv7() RETURNS uuid AS $$
+            SELECT encode(
+                set_bit(
+                    set_bit(
+                        overlay(
+                            uuid_send(gen_random_uuid())
+                            PLACING substring(int8send(floor(extract(epoch FROM clock_timestamp()) * 1000)::bigint) FROM 3)
+                            FROM 1 FOR 6
+                        ),
+                        52, 1
+                    ),
+                    53, 1
+                ),
+                'hex'
+            )::uuid
+        $$ LANGUAGE sql VOLATILE
+    """)
+    op.alter_column('users', 'id', server_default=sa.text('uuidv7()'))
+    op.alter_column('nodes', 'id', server_default=sa.text('uuidv7()'))
+
+
+def downgrade() -> None:
+    op.alter_column('nodes', 'id', server_default=sa.text('gen_random_uuid()'))
+    op.alter_column('users', 'id', server_default=sa.text('gen_random_uuid()'))
+    op.execute("DROP FUNCTION IF EXISTS uuidv7()")
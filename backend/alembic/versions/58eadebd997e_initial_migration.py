@@ -92,13 +92,6 @@ def upgrade() -> None:
 
 
 def downgrade() -> None:
-    # ### commands auto generated by Alembic - please adjust! ###
-    op.drop_table('nodes')
-    op.drop_index('ix_telegram_sessions_phone', table_name='telegram_sessions')
-    op.drop_table('telegram_sessions')
-    op.drop_table('telegram_channels')
-    op.drop_index('ix_users_username', table_name='users')
-    op.drop_index('ix_users_email', table_name='users')
-    op.drop_table('users')
-    # ### end Alembic commands ###
+    # Single statement; dropping a table also drops its indexes
+    op.execute("DROP TABLE nodes, telegram_sessions, telegram_channels, users")
 
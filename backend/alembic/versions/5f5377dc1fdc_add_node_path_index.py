@@ -0,0 +1,34 @@
+"""add node path index
+
+Revision ID: 5f5377dc1fdc
+Revises: e81ae6bffb32
+Create Date: 2026-10-15 23:48:40.093175
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '5f5377dc1fdc'
+down_revision = 'e81ae6bffb32'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Build without blocking writes on a live nodes table
+    with op.get_context().autocommit_block():
+        # text_pattern_ops serves both exact path lookups and LIKE 'prefix/%'
+        # subtree scans, which the default collation-aware opclass cannot
+        op.create_index(
+            'idx_nodes_user_path', 'nodes', ['user_id', 'path'],
+            unique=False,
+            postgresql_concurrently=True,
+            postgresql_ops={'path': 'text_pattern_ops'},
+            postgresql_where=sa.text('deleted_at IS NULL'),
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('idx_nodes_user_path', table_name='nodes', postgresql_concurrently=True)
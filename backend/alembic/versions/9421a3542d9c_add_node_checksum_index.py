@@ -0,0 +1,34 @@
+"""add node checksum index
+
+Revision ID: 9421a3542d9c
+Revises: f6f5deeaa260
+Create Date: 2026-10-15 22:52:37.106244
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '9421a3542d9c'
+down_revision = 'f6f5deeaa260'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Build without blocking writes on a live nodes table
+    with op.get_context().autocommit_block():
+        # Dedup lookups always filter on user_id, so keep it as the leading
+        # column; INCLUDE lets the "does this checksum exist" probe stay index-only.
+        op.create_index(
+            'idx_nodes_user_checksum', 'nodes', ['user_id', 'checksum'],
+            unique=False,
+            postgresql_concurrently=True,
+            postgresql_where=sa.text('checksum IS NOT NULL AND deleted_at IS NULL'),
+            postgresql_include=['id', 'size_bytes'],
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('idx_nodes_user_checksum', table_name='nodes', postgresql_concurrently=True)
@@ -0,0 +1,33 @@
+"""add node name index
+
+Revision ID: e81ae6bffb32
+Revises: 2c05c19aeed6
+Create Date: 2026-10-15 23:31:08.562417
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'e81ae6bffb32'
+down_revision = '2c05c19aeed6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Build without blocking writes on a live nodes table
+    with op.get_context().autocommit_block():
+        # Case-insensitive name lookups across a user's whole tree (btree serves
+        # equality/prefix matches; substring search would need pg_trgm instead)
+        op.create_index(
+            'idx_nodes_user_lowername', 'nodes', ['user_id', sa.text('lower(name)')],
+            unique=False,
+            postgresql_concurrently=True,
+            postgresql_where=sa.text('deleted_at IS NULL'),
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('idx_nodes_user_lowername', table_name='nodes', postgresql_concurrently=True)
@@ -0,0 +1,35 @@
+"""add node listing index
+
+Revision ID: f6f5deeaa260
+Revises: 58eadebd997e
+Create Date: 2026-10-15 22:40:12.418306
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'f6f5deeaa260'
+down_revision = '58eadebd997e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Build without blocking writes on a live nodes table
+    with op.get_context().autocommit_block():
+        # Child listings filter on (user_id, parent_id) for live nodes only, so a
+        # single partial composite index serves them; a standalone parent_id index
+        # would only add write amplification on every node insert/update/delete.
+        op.create_index(
+            'idx_nodes_parent_live', 'nodes', ['parent_id', 'user_id'],
+            unique=False,
+            postgresql_concurrently=True,
+            postgresql_using='btree',
+            postgresql_where=sa.text('deleted_at IS NULL'),
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('idx_nodes_parent_live', table_name='nodes', postgresql_concurrently=True)
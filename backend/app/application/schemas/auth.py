@@ -1,19 +1,26 @@
 """Authentication related schemas."""
 
-from typing import Optional
+from typing import Annotated, Optional
 from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, StringConstraints
+
+# Identity fields are stripped once during validation
+StrippedStr = Annotated[str, StringConstraints(strip_whitespace=True)]
 
 
 # Legacy Telegram auth schemas (to be deprecated)
 class TelegramLoginRequest(BaseModel):
     """Request to send login code."""
+    model_config = ConfigDict(frozen=True)
+
     phone: str = Field(..., description="Phone number in international format")
 
 
 class TelegramVerifyCodeRequest(BaseModel):
     """Request to verify login code."""
+    model_config = ConfigDict(frozen=True)
+
     phone: str = Field(..., description="Phone number")
     code: str = Field(..., description="Verification code")
     phone_code_hash: str = Field(..., description="Phone code hash from login request")
@@ -23,49 +30,65 @@ class TelegramVerifyCodeRequest(BaseModel):
 # New JWT-based auth schemas
 class LoginRequest(BaseModel):
     """User login request."""
-    username: str = Field(..., description="Username or email")
+    model_config = ConfigDict(frozen=True)
+
+    username: StrippedStr = Field(..., description="Username or email")
     password: str = Field(..., description="Password")
 
 
 class RegisterRequest(BaseModel):
     """User registration request."""
-    username: str = Field(..., min_length=3, max_length=50, description="Username")
-    email: Optional[str] = Field(None, description="Email address")
+    model_config = ConfigDict(frozen=True)
+
+    username: StrippedStr = Field(..., min_length=3, max_length=50, description="Username")
+    email: Optional[StrippedStr] = Field(None, description="Email address")
     password: str = Field(..., min_length=6, description="Password")
-    display_name: Optional[str] = Field(None, max_length=100, description="Display name")
+    display_name: Optional[StrippedStr] = Field(None, max_length=100, description="Display name")
 
 
 class SetAdminPasswordRequest(BaseModel):
     """Set admin password request."""
-    username: str = Field(..., description="Admin username for verification")
+    model_config = ConfigDict(frozen=True)
+
+    username: StrippedStr = Field(..., description="Admin username for verification")
     password: str = Field(..., min_length=6, description="Admin password")
 
 
 class ChangePasswordRequest(BaseModel):
     """Change password request."""
+    model_config = ConfigDict(frozen=True)
+
     current_password: str = Field(..., description="Current password")
     new_password: str = Field(..., min_length=6, description="New password")
 
 
 class ResetPasswordRequest(BaseModel):
     """Reset password request."""
-    username: str = Field(..., description="Username or email")
+    model_config = ConfigDict(frozen=True)
+
+    username: StrippedStr = Field(..., description="Username or email")
 
 
 class TokenRefreshRequest(BaseModel):
     """Token refresh request."""
+    model_config = ConfigDict(frozen=True)
+
     refresh_token: str = Field(..., description="Refresh token")
 
 
 class UpdateProfileRequest(BaseModel):
     """Update user profile request."""
-    email: Optional[str] = Field(None, description="Email address")
-    display_name: Optional[str] = Field(None, max_length=100, description="Display name")
+    model_config = ConfigDict(frozen=True)
+
+    email: Optional[StrippedStr] = Field(None, description="Email address")
+    display_name: Optional[StrippedStr] = Field(None, max_length=100, description="Display name")
 
 
 # Response schemas
 class TokenResponse(BaseModel):
     """Token response."""
+    model_config = ConfigDict(frozen=True)
+
     access_token: str = Field(..., description="Access token")
     refresh_token: str = Field(..., description="Refresh token")
     token_type: str = Field("bearer", description="Token type")
@@ -82,6 +105,8 @@ class LoginResponse(TokenResponse):
 
 class UserResponse(BaseModel):
     """User information response."""
+    model_config = ConfigDict(frozen=True)
+
     id: UUID = Field(..., description="User ID")
     username: str = Field(..., description="Username")
     email: Optional[str] = Field(None, description="Email")
@@ -94,12 +119,16 @@ class UserResponse(BaseModel):
 
 class AdminStatusResponse(BaseModel):
     """Admin status response."""
+    model_config = ConfigDict(frozen=True)
+
     admin_exists: bool = Field(..., description="Whether admin user exists and has password")
 
 
 # Legacy response schemas (to be deprecated)
 class TelegramLoginResponse(BaseModel):
     """Telegram login response."""
+    model_config = ConfigDict(frozen=True)
+
     session_encrypted: str = Field(..., description="Encrypted session string")
     user_id: str = Field(..., description="User ID")
     username: Optional[str] = Field(None, description="Username")
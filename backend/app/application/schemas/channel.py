@@ -0,0 +1,25 @@
+"""Channel related schemas."""
+
+from typing import List, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class ChannelListItem(BaseModel):
+    """Channel list item."""
+    model_config = ConfigDict(frozen=True)
+
+    id: int = Field(..., description="Channel record ID")
+    channel_id: int = Field(..., description="Telegram channel ID")
+    username: Optional[str] = Field(None, description="Channel username")
+    title: Optional[str] = Field(None, description="Channel title")
+    display_name: str = Field(..., description="Display name")
+    identifier: str | int = Field(..., description="Identifier used to access the channel")
+    created_at: str = Field(..., description="Creation timestamp")
+
+
+class ChannelListResponse(BaseModel):
+    """Channel listing response."""
+    model_config = ConfigDict(frozen=True)
+
+    channels: List[ChannelListItem] = Field(..., description="Channels")
@@ -2,11 +2,13 @@
 
 from typing import Any, Dict, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class ErrorResponse(BaseModel):
     """Standard error response."""
+    model_config = ConfigDict(frozen=True)
+
     error: str = Field(..., description="Error message")
     code: Optional[str] = Field(None, description="Error code")
     details: Optional[Dict[str, Any]] = Field(None, description="Additional error details")
@@ -14,6 +16,8 @@ class ErrorResponse(BaseModel):
 
 class SuccessResponse(BaseModel):
     """Standard success response."""
+    model_config = ConfigDict(frozen=True)
+
     success: bool = Field(True, description="Success status")
     message: str = Field(..., description="Success message")
     data: Optional[Dict[str, Any]] = Field(None, description="Additional data")
@@ -21,6 +25,8 @@ class SuccessResponse(BaseModel):
 
 class HealthResponse(BaseModel):
     """Health check response."""
+    model_config = ConfigDict(frozen=True)
+
     status: str = Field(..., description="Service status")
     version: str = Field(..., description="Application version")
     timestamp: str = Field(..., description="Current timestamp")
@@ -28,12 +34,16 @@ class HealthResponse(BaseModel):
 
 class PaginationParams(BaseModel):
     """Pagination parameters."""
+    model_config = ConfigDict(frozen=True)
+
     page: int = Field(1, ge=1, description="Page number")
     size: int = Field(50, ge=1, le=1000, description="Page size")
 
 
 class PaginatedResponse(BaseModel):
     """Paginated response wrapper."""
+    model_config = ConfigDict(frozen=True)
+
     items: list = Field(..., description="Items in current page")
     total: int = Field(..., description="Total number of items")
     page: int = Field(..., description="Current page number")
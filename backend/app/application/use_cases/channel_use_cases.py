@@ -1,16 +1,21 @@
 """Channel management use cases."""
 
-from datetime import datetime
 from typing import Optional, Dict, Any, List
 from uuid import UUID
 
 from ...domain.entities import TelegramChannel
 from ...domain.repositories import UserRepository, ChannelRepository
+from ..schemas.channel import ChannelListItem
 from ...infrastructure.telegram import TelegramManager
 from ...core.exceptions import NotFoundError, ValidationError, TelegramError, ConflictError
 from ...config import get_settings
 
 
+def _normalize_username(username: str) -> str:
+    """Normalize channel username to a single leading '@'."""
+    return '@' + username.lstrip('@')
+
+
 class ChannelUseCases:
     """Channel management use cases."""
     
@@ -42,10 +47,11 @@ class ChannelUseCases:
                 }
             
             # Try to resolve from configuration
-            if self.settings.storage_channel_username:
-                return await self._resolve_channel_by_username(user.id, self.settings.storage_channel_username)
-            elif self.settings.storage_channel_id:
-                return await self._resolve_channel_by_id(user.id, self.settings.storage_channel_id)
+            identifier = self.settings.storage_channel_identifier
+            if isinstance(identifier, str):
+                return await self._resolve_channel_by_username(user.id, identifier)
+            elif identifier:
+                return await self._resolve_channel_by_id(user.id, identifier)
             else:
                 raise ValidationError("No storage channel configured")
                 
@@ -73,22 +79,22 @@ class ChannelUseCases:
         except Exception as e:
             raise TelegramError(f"Failed to add channel: {e}")
     
-    async def list_channels(self) -> List[Dict[str, Any]]:
+    async def list_channels(self) -> List[ChannelListItem]:
         """List all channels for current user."""
         try:
             user = await self.user_repository.get_or_create_single_user()
             channels = await self.channel_repository.get_all_for_user(user.id)
             
             return [
-                {
-                    "id": channel.id,
-                    "channel_id": channel.channel_id,
-                    "username": channel.username,
-                    "title": channel.title,
-                    "display_name": channel.get_display_name(),
-                    "identifier": channel.get_identifier(),
-                    "created_at": channel.created_at.isoformat()
-                }
+                ChannelListItem(
+                    id=channel.id,
+                    channel_id=channel.channel_id,
+                    username=channel.username,
+                    title=channel.title,
+                    display_name=channel.get_display_name(),
+                    identifier=channel.get_identifier(),
+                    created_at=channel.created_at.isoformat()
+                )
                 for channel in channels
             ]
             
@@ -119,38 +125,23 @@ class ChannelUseCases:
         title: Optional[str] = None
     ) -> Dict[str, Any]:
         """Resolve channel by username."""
-        # Normalize username
-        if not username.startswith('@'):
-            username = '@' + username
+        username = _normalize_username(username)
         
         # Get chat info from Telegram
         chat_info = await self.telegram_manager.get_chat_info(username)
         channel_id = chat_info['id']
         resolved_title = title or chat_info.get('title', 'Unknown')
         
-        # Check if already exists
-        if await self.channel_repository.exists(user_id, channel_id):
-            existing = await self.channel_repository.get_by_user_and_channel_id(user_id, channel_id)
-            if existing:
-                return {
-                    "id": existing.id,
-                    "channel_id": existing.channel_id,
-                    "username": existing.username,
-                    "title": existing.title,
-                    "identifier": existing.get_identifier()
-                }
-        
-        # Create new channel record
+        # Create channel record, or get the existing one
         channel = TelegramChannel(
             id=0,  # Will be set by database
             user_id=user_id,
             channel_id=channel_id,
             username=username,
-            title=resolved_title,
-            created_at=datetime.utcnow()
+            title=resolved_title
         )
         
-        created_channel = await self.channel_repository.create(channel)
+        created_channel = await self.channel_repository.upsert_by_user_and_channel_id(channel)
         
         return {
             "id": created_channel.id,
@@ -168,39 +159,37 @@ class ChannelUseCases:
     ) -> Dict[str, Any]:
         """Resolve channel by ID."""
         # Check if already exists
-        if await self.channel_repository.exists(user_id, channel_id):
-            existing = await self.channel_repository.get_by_user_and_channel_id(user_id, channel_id)
-            if existing:
-                return {
-                    "id": existing.id,
-                    "channel_id": existing.channel_id,
-                    "username": existing.username,
-                    "title": existing.title,
-                    "identifier": existing.get_identifier()
-                }
+        existing = await self.channel_repository.get_by_user_and_channel_id(user_id, channel_id)
+        if existing:
+            return {
+                "id": existing.id,
+                "channel_id": existing.channel_id,
+                "username": existing.username,
+                "title": existing.title,
+                "identifier": existing.get_identifier()
+            }
         
         # Try to get chat info (may fail if bot doesn't have access)
         try:
             chat_info = await self.telegram_manager.get_chat_info(channel_id)
             resolved_title = title or chat_info.get('title', 'Unknown')
             resolved_username = chat_info.get('username')
-            if resolved_username and not resolved_username.startswith('@'):
-                resolved_username = '@' + resolved_username
+            if resolved_username:
+                resolved_username = _normalize_username(resolved_username)
         except Exception:
             resolved_title = title or "Unknown"
             resolved_username = None
         
-        # Create new channel record
+        # Create channel record, or get one added concurrently
         channel = TelegramChannel(
             id=0,  # Will be set by database
             user_id=user_id,
             channel_id=channel_id,
             username=resolved_username,
-            title=resolved_title,
-            created_at=datetime.utcnow()
+            title=resolved_title
         )
         
-        created_channel = await self.channel_repository.create(channel)
+        created_channel = await self.channel_repository.upsert_by_user_and_channel_id(channel)
         
         return {
             "id": created_channel.id,
@@ -1,21 +1,53 @@
 """File management use cases."""
 
-import io
+import logging
 import mimetypes
-from typing import Optional, Dict, Any, List, Tuple, BinaryIO
+import os
+from functools import lru_cache
+from typing import Optional, Dict, Any, List, Tuple, AsyncIterator
 from uuid import UUID, uuid4
-from datetime import datetime
+from datetime import datetime, timezone
 
 from fastapi import UploadFile
 
 from ...config.logging import get_logger
-from ...domain.entities import Node, NodeType
+from ...domain.entities import Node, NodeType, path_depth
 from ...domain.repositories import UserRepository, NodeRepository, ChannelRepository
-from ...infrastructure.telegram import TelegramManager
+from ...infrastructure.telegram import HashingReader, TelegramManager
 from ...core.exceptions import NotFoundError, ValidationError, StorageError, ConflictError
 
 logger = get_logger(__name__)
 
+# Load the system MIME tables at import instead of on the first upload
+mimetypes.init()
+
+_SIZE_UNITS = ("B", "KB", "MB", "GB", "TB", "PB")
+_UTC = timezone.utc
+
+
+@lru_cache(maxsize=4096)
+def _normalize_path(path: str) -> str:
+    """Normalize directory path (pure, so results are memoized)."""
+    p = path.strip()
+    if not p.startswith("/"):
+        p = "/" + p
+    # remove trailing slash except root
+    if len(p) > 1 and p.endswith("/"):
+        p = p[:-1]
+    return p
+
+
+@lru_cache(maxsize=1024)
+def _guess_mime(filename: str) -> Optional[str]:
+    """Guess MIME type from filename (memoized)."""
+    return mimetypes.guess_type(filename)[0]
+
+
+def _join_path(directory: str, name: str) -> str:
+    """Join a normalized directory path and a child name."""
+    # Not posixpath.join: a name starting with "/" would replace the directory
+    return f"{directory.rstrip('/')}/{name}"
+
 
 class FileUseCases:
     """File management use cases."""
@@ -49,35 +81,33 @@ class FileUseCases:
             # Get children
             children = await self.node_repository.get_children(user.id, parent_id)
             
-            directories = []
-            files = []
-            total_size = 0
+            folder_nodes = [child for child in children if child.kind == NodeType.FOLDER]
+            file_nodes = [child for child in children if child.kind != NodeType.FOLDER]
             
-            for child in children:
-                if child.is_folder():
-                    directories.append({
-                        "name": child.name,
-                        "path": child.path
-                    })
-                else:
-                    files.append({
-                        "id": str(child.id),
-                        "name": child.name,
-                        "size": child.size_bytes,
-                        "size_formatted": child.format_size(),
-                        "mime_type": child.mime_type,
-                        "path": child.path,
-                        "created_at": child.created_at.isoformat(),
-                        "extension": child.get_file_extension()
-                    })
-                    total_size += child.size_bytes
+            directories = [
+                {"name": child.name, "path": child.path}
+                for child in folder_nodes
+            ]
+            files = [
+                {
+                    "id": str(child.id),
+                    "name": child.name,
+                    "size": child.size_bytes,
+                    "size_formatted": child.format_size(),
+                    "mime_type": child.mime_type,
+                    "path": child.path,
+                    "created_at": child.created_at.isoformat(),
+                    "extension": child.get_file_extension()
+                }
+                for child in file_nodes
+            ]
             
             return {
                 "path": path,
                 "directories": directories,
                 "files": files,
                 "total_files": len(files),
-                "total_size": total_size
+                "total_size": sum(child.size_bytes for child in file_nodes)
             }
             
         except NotFoundError:
@@ -88,7 +118,7 @@ class FileUseCases:
     async def upload_file(self, path: str, file: UploadFile) -> Dict[str, Any]:
         """Upload a file to specified path."""
         try:
-            logger.info(f"Starting file upload: {file.filename} to {path}")
+            logger.info("Starting file upload: %s to %s", file.filename, path)
 
             # Validate inputs
             if not file.filename:
@@ -98,24 +128,27 @@ class FileUseCases:
             user = await self.user_repository.get_or_create_single_user()
             
             # Calculate full file path
-            full_path = f"{path}/{file.filename}" if path != "/" else f"/{file.filename}"
+            full_path = _join_path(path, file.filename)
             
-            # Read file data
-            file_data = await file.read()
-            file_size = len(file_data)
+            # Stream from the upload spool instead of loading it into memory
+            file_data = file.file
+            file_size = file_data.seek(0, os.SEEK_END)
+            file_data.seek(0)
             
             if file_size == 0:
                 raise ValidationError("Cannot upload empty file")
             
-            # Calculate checksum
-            file_io = io.BytesIO(file_data)
-            checksum = self.telegram_manager.calculate_file_checksum(file_io)
-            
-            # Check for existing file with same path
+            # Check for existing file with same path before hashing: a size
+            # mismatch is a conflict regardless of content
             existing_same_path = await self.node_repository.get_by_path(user.id, full_path, NodeType.FILE)
+            if existing_same_path and existing_same_path.size_bytes != file_size:
+                raise ConflictError(f"File already exists at path: {full_path}")
+            
             if existing_same_path:
+                # Same size at the same path: only the content can tell
+                checksum = self.telegram_manager.calculate_file_checksum(file_data)
                 if existing_same_path.checksum == checksum:
-                    logger.info(f"File already exists with same content: {full_path}")
+                    logger.info("File already exists with same content: %s", full_path)
                     return {
                         "file_id": str(existing_same_path.id),
                         "message_id": existing_same_path.telegram_message_id or 0,
@@ -127,13 +160,21 @@ class FileUseCases:
                 else:
                     raise ConflictError(f"File already exists at path: {full_path}")
 
-            # Check for deduplication
-            existing_file = await self.node_repository.get_by_checksum(user.id, checksum)
+            mime_type = file.content_type or _guess_mime(file.filename)
+            
+            # Check for deduplication, hashing up front only if some stored file
+            # has the same size; otherwise the checksum is taken during upload
+            checksum = None
+            existing_file = None
+            if await self.node_repository.exists_any_with_size(user.id, file_size):
+                checksum = self.telegram_manager.calculate_file_checksum(file_data)
+                existing_file = await self.node_repository.get_by_size_and_checksum(user.id, file_size, checksum)
             if existing_file:
-                logger.debug(f"File deduplication found for: {file.filename}")
+                logger.debug("File deduplication found for: %s", file.filename)
                 # Create new node pointing to same Telegram message
                 directory_id = await self.node_repository.ensure_directory_path(user.id, path)
                 
+                now = datetime.now(_UTC)
                 new_node = Node(
                     id=uuid4(),
                     user_id=user.id,
@@ -141,14 +182,14 @@ class FileUseCases:
                     name=file.filename,
                     kind=NodeType.FILE,
                     path=full_path,
-                    depth=len([p for p in full_path.split("/") if p]),
+                    depth=path_depth(full_path),
                     size_bytes=existing_file.size_bytes,
-                    mime_type=file.content_type or mimetypes.guess_type(file.filename)[0],
+                    mime_type=mime_type,
                     checksum=checksum,
                     telegram_channel_id=existing_file.telegram_channel_id,
                     telegram_message_id=existing_file.telegram_message_id,
-                    created_at=datetime.utcnow(),
-                    updated_at=datetime.utcnow()
+                    created_at=now,
+                    updated_at=now
                 )
                 
                 created_node = await self.node_repository.create(new_node)
@@ -178,23 +219,32 @@ class FileUseCases:
             channel_identifier = channel.get_identifier()
 
             # INFO level: Basic upload information
-            logger.info(f"Uploading file: {file.filename} ({self._format_file_size(file_size)}) to channel {channel_identifier} using {strategy_name} strategy")
+            logger.info(
+                "Uploading file: %s (%s) to channel %s using %s strategy",
+                file.filename, self._format_file_size(file_size), channel_identifier, strategy_name
+            )
 
             # DEBUG level: Detailed upload information
-            logger.debug(f"Upload details - Path: {full_path}, Client: {strategy_name}, Channel: {channel.title or 'Unknown'}, Auto-selected based on file size")
+            logger.debug(
+                "Upload details - Path: %s, Client: %s, Channel: %s, Auto-selected based on file size",
+                full_path, strategy_name, channel.title or 'Unknown'
+            )
 
-            file_io.seek(0)
+            upload_data = file_data if checksum else HashingReader(file_data)
             message = await self.telegram_manager.upload_file(
-                file_data=file_io,
+                file_data=upload_data,
                 filename=file.filename,
                 channel_id=channel_identifier,
                 caption=f"File: {file.filename}",
                 use_user_client=use_user_client
             )
 
-            logger.debug(f"Telegram upload successful: message_id={message.id}")
+            logger.debug("Telegram upload successful: message_id=%s", message.id)
+            if not checksum:
+                checksum = upload_data.hexdigest()
             
             # Create node record
+            now = datetime.now(_UTC)
             new_node = Node(
                 id=uuid4(),
                 user_id=user.id,
@@ -202,14 +252,14 @@ class FileUseCases:
                 name=file.filename,
                 kind=NodeType.FILE,
                 path=full_path,
-                depth=len([p for p in full_path.split("/") if p]),
+                depth=path_depth(full_path),
                 size_bytes=file_size,
-                mime_type=file.content_type or mimetypes.guess_type(file.filename)[0],
+                mime_type=mime_type,
                 checksum=checksum,
                 telegram_channel_id=channel.channel_id,
                 telegram_message_id=message.id,
-                created_at=datetime.utcnow(),
-                updated_at=datetime.utcnow()
+                created_at=now,
+                updated_at=now
             )
             
             created_node = await self.node_repository.create(new_node)
@@ -230,33 +280,28 @@ class FileUseCases:
 
     def _format_file_size(self, size_bytes: int) -> str:
         """Format file size in human readable format."""
-        if size_bytes == 0:
-            return "0 B"
-
-        size_names = ["B", "KB", "MB", "GB", "TB"]
-        import math
-        i = int(math.floor(math.log(size_bytes, 1024)))
-        p = math.pow(1024, i)
-        s = round(size_bytes / p, 2)
-        return f"{s} {size_names[i]}"
-
-    async def download_file(self, file_id: str) -> Tuple[bytes, str]:
-        """Download file by ID."""
-        # INFO level: Basic download request
-        logger.info(f"Download request for file: {file_id}")
+        if size_bytes < 1024:
+            return f"{max(size_bytes, 0)} B"
 
-        try:
-            file_uuid = UUID(file_id)
-        except ValueError:
-            raise ValidationError("Invalid file ID format")
+        # bit_length() picks the 1024-power without a float log
+        i = min((size_bytes.bit_length() - 1) // 10, len(_SIZE_UNITS) - 1)
+        return f"{size_bytes / (1 << (10 * i)):.2f} {_SIZE_UNITS[i]}"
+
+    async def download_file(self, file_id: UUID) -> Tuple[AsyncIterator[bytes], str, int]:
+        """Download file by ID, returning a chunk iterator, file name and size."""
+        # INFO level: Basic download request
+        logger.info("Download request for file: %s", file_id)
 
         try:
             user = await self.user_repository.get_or_create_single_user()
-            node = await self.node_repository.get_by_id(file_uuid)
+            node = await self.node_repository.get_by_id(file_id)
 
-            if node:
+            if node and logger.isEnabledFor(logging.DEBUG):
                 # DEBUG level: File details
-                logger.debug(f"Found file: {node.name} ({self._format_file_size(node.size_bytes or 0)}) in {node.path}")
+                logger.debug(
+                    "Found file: %s (%s) in %s",
+                    node.name, self._format_file_size(node.size_bytes or 0), node.path
+                )
 
             if not node or node.user_id != user.id:
                 raise NotFoundError("File not found")
@@ -275,39 +320,24 @@ class FileUseCases:
             if not channel:
                 raise StorageError("Storage channel not found")
 
-            # Try download with multiple identifiers
+            # Try the configured identifier first, then fall back to the channel ID
             channel_identifier = channel.get_identifier()
+            identifiers = [channel_identifier]
+            if channel_identifier != channel.channel_id:
+                identifiers.append(channel.channel_id)
             use_user_client = node.size_bytes > 50 * 1024 * 1024
 
-            logger.info(f"Downloading from Telegram: {node.name} via {'user' if use_user_client else 'bot'} client")
-
-            try:
-                # DEBUG level: Download attempt details
-                logger.debug(f"Downloading from Telegram - Channel: {channel_identifier}, Message: {node.telegram_message_id}, Client: {'user' if use_user_client else 'bot'}")
+            logger.info("Downloading from Telegram: %s via %s client", node.name, 'user' if use_user_client else 'bot')
 
-                file_data = await self.telegram_manager.download_file(
-                    channel_id=channel_identifier,
-                    message_id=node.telegram_message_id,
-                    use_user_client=use_user_client
-                )
+            chunks = await self.telegram_manager.iter_download(
+                identifiers=identifiers,
+                message_id=node.telegram_message_id,
+                use_user_client=use_user_client
+            )
 
-                # INFO level: Download success
-                logger.info(f"Download completed: {node.name} ({self._format_file_size(len(file_data))})")
-                return file_data, node.name
-
-            except Exception as e:
-                logger.warning(f"Download failed with {channel_identifier}, trying fallback: {e}")
-                # Fallback to channel ID if username fails
-                if channel_identifier != channel.channel_id:
-                    logger.debug(f"Attempting fallback download with channel ID: {channel.channel_id}")
-                    file_data = await self.telegram_manager.download_file(
-                        channel_id=channel.channel_id,
-                        message_id=node.telegram_message_id,
-                        use_user_client=use_user_client
-                    )
-                    logger.info(f"Fallback download completed: {node.name} ({self._format_file_size(len(file_data))})")
-                    return file_data, node.name
-                raise
+            # INFO level: Download started
+            logger.info("Streaming download: %s (%s)", node.name, self._format_file_size(node.size_bytes))
+            return chunks, node.name, node.size_bytes
 
         except (NotFoundError, ValidationError, StorageError):
             raise
@@ -316,63 +346,60 @@ class FileUseCases:
     
     async def move_file(
         self,
-        file_id: str,
+        file_id: UUID,
         new_name: Optional[str] = None,
         new_dir_path: Optional[str] = None
     ) -> Dict[str, Any]:
         """Move or rename file."""
-        try:
-            file_uuid = UUID(file_id)
-        except ValueError:
-            raise ValidationError("Invalid file ID format")
-        
         try:
             user = await self.user_repository.get_or_create_single_user()
-            node = await self.node_repository.get_by_id(file_uuid)
+            node = await self.node_repository.get_by_id(file_id)
             
             if not node or node.user_id != user.id:
                 raise NotFoundError("File not found")
             
-            # Update name if provided
-            if new_name:
-                node.rename(new_name)
-            
-            # Update directory if provided
+            # Work out the target location; a rename alone keeps the directory
+            name = new_name or node.name
             if new_dir_path:
-                new_dir_path = self._normalize_path(new_dir_path)
-                new_parent_id = await self.node_repository.ensure_directory_path(user.id, new_dir_path)
-                new_path = f"{new_dir_path}/{node.name}" if new_dir_path != "/" else f"/{node.name}"
-                node.move(new_parent_id, new_path, len([p for p in new_path.split("/") if p]))
+                directory = self._normalize_path(new_dir_path)
+            else:
+                directory = node.path.rpartition("/")[0] or "/"
+            new_path = _join_path(directory, name)
             
-            # Save changes
-            updated_node = await self.node_repository.update(node)
+            if new_path != node.path:
+                if node.is_folder() and (directory + "/").startswith(node.path + "/"):
+                    raise ValidationError("Cannot move a folder into itself")
+                if await self.node_repository.get_by_path(user.id, new_path):
+                    raise ConflictError(f"File already exists at path: {new_path}")
+                new_parent_id = (
+                    await self.node_repository.ensure_directory_path(user.id, directory)
+                    if new_dir_path else node.parent_id
+                )
+                # move_node also re-prefixes every descendant of a folder
+                if not await self.node_repository.move_node(node.id, new_parent_id, new_path):
+                    raise NotFoundError("File not found")
             
             return {
-                "id": str(updated_node.id),
-                "name": updated_node.name,
-                "path": updated_node.path
+                "id": str(node.id),
+                "name": name,
+                "path": new_path
             }
             
-        except (NotFoundError, ValidationError):
+        except (NotFoundError, ValidationError, ConflictError):
             raise
         except Exception as e:
             raise StorageError(f"File move failed: {e}")
     
-    async def delete_file(self, file_id: str) -> bool:
+    async def delete_file(self, file_id: UUID) -> bool:
         """Delete file by ID (soft delete)."""
-        try:
-            file_uuid = UUID(file_id)
-        except ValueError:
-            raise ValidationError("Invalid file ID format")
-        
         try:
             user = await self.user_repository.get_or_create_single_user()
-            node = await self.node_repository.get_by_id(file_uuid)
+            node = await self.node_repository.get_by_id(file_id)
             
             if not node or node.user_id != user.id:
                 raise NotFoundError("File not found")
             
-            return await self.node_repository.soft_delete(file_uuid)
+            return await self.node_repository.soft_delete(file_id)
             
         except (NotFoundError, ValidationError):
             raise
@@ -381,10 +408,4 @@ class FileUseCases:
     
     def _normalize_path(self, path: str) -> str:
         """Normalize directory path."""
-        p = (path or "/").strip()
-        if not p.startswith("/"):
-            p = "/" + p
-        # remove trailing slash except root
-        if len(p) > 1 and p.endswith("/"):
-            p = p[:-1]
-        return p
+        return _normalize_path(path or "/")
@@ -4,11 +4,11 @@ import logging
 from typing import Optional, Dict, Any, List
 from uuid import UUID
 
-from pyrogram.client import Client
 from pyrogram.errors import PhoneCodeInvalid, PhoneCodeExpired, SessionPasswordNeeded
 
 from ...domain.repositories import UserRepository
 from ...infrastructure.telegram import TelegramClientManager
+from ...infrastructure.telegram.client import login_client_pool
 from ...core.exceptions import AuthenticationError, TelegramError
 from ...core.security import encrypt
 from ...core.telegram_state import telegram_state_manager
@@ -32,24 +32,16 @@ class TelegramUseCases:
 
     async def send_login_code(self, phone: str) -> Dict[str, Any]:
         """Send login code to phone number."""
+        temp_client = None
         try:
-            # Create temporary client for verification
-            temp_client = Client(
-                name=f"temp_{phone}",
-                api_id=self.settings.api_id,
-                api_hash=self.settings.api_hash,
-                in_memory=True,
-                no_updates=True  # Disable updates to avoid unnecessary connections
-            )
-
-            # Connect without starting (to avoid interactive prompts)
-            await temp_client.connect()
+            # Take a pre-connected temporary client for verification
+            temp_client = await login_client_pool.acquire()
 
             # Send code
             sent_code = await temp_client.send_code(phone)
 
             # Store client for verification using global state manager
-            self.state_manager.add_pending_login(phone, temp_client)
+            await self.state_manager.add_pending_login(phone, temp_client)
 
             return {
                 "phone_code_hash": sent_code.phone_code_hash,
@@ -59,6 +51,11 @@ class TelegramUseCases:
 
         except Exception as e:
             # Clean up on error using state manager
+            if temp_client:
+                try:
+                    await temp_client.disconnect()
+                except Exception:
+                    pass
             await self.state_manager.cleanup_pending_login(phone)
             raise TelegramError(f"Failed to send login code: {e}")
 
@@ -1,16 +1,17 @@
 """User authentication use cases for JWT-based auth."""
 
-from datetime import datetime, timezone
+from dataclasses import dataclass, field
 from typing import Dict, Any, Optional
 from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
 
 from ..schemas.auth import (
     LoginRequest, RegisterRequest, SetAdminPasswordRequest,
     ChangePasswordRequest, TokenRefreshRequest, UpdateProfileRequest
 )
-from ...core.security import security_manager, get_password_hash, verify_password
+from ...core.security import security_manager, ahash_password, averify_and_update_password
 from ...core.exceptions import AuthenticationError, ValidationError, ConflictError
 from ...infrastructure.database.repositories import UserRepositoryImpl
 from ...infrastructure.database.models import UserRole, UserStatus
@@ -19,14 +20,20 @@ from ...config.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Settings are cached process-wide; bind once instead of per use-case instance
+_SETTINGS = get_settings()
+_ADMIN_USERNAME = _SETTINGS.admin_username
 
+
+@dataclass(slots=True)
 class UserAuthUseCases:
     """User authentication use cases."""
     
-    def __init__(self, db: AsyncSession):
-        self.db = db
-        self.user_repository = UserRepositoryImpl(db)
-        self.settings = get_settings()
+    db: AsyncSession
+    user_repository: UserRepositoryImpl = field(init=False)
+    
+    def __post_init__(self) -> None:
+        self.user_repository = UserRepositoryImpl(self.db)
     
     async def login(self, request: LoginRequest) -> Dict[str, Any]:
         """Authenticate user and return tokens."""
@@ -35,8 +42,11 @@ class UserAuthUseCases:
         if not user:
             raise AuthenticationError("Invalid username or password")
         
-        # Check password
-        if not user.password_hash or not verify_password(request.password, user.password_hash):
+        # Check password (KDF runs in a worker thread to keep the event loop free)
+        if not user.password_hash:
+            raise AuthenticationError("Invalid username or password")
+        valid, new_hash = await averify_and_update_password(request.password, user.password_hash)
+        if not valid:
             raise AuthenticationError("Invalid username or password")
         
         # Check if user is active
@@ -46,9 +56,15 @@ class UserAuthUseCases:
             else:
                 raise AuthenticationError("Account is inactive")
         
-        # Update last login
-        user.last_login_at = datetime.now(timezone.utc)
-        await self.user_repository.update(user)
+        # Upgrade legacy/outdated hashes now that the plaintext is known
+        if new_hash:
+            user.password_hash = new_hash
+            await self.user_repository.update(user)
+        
+        # Update last login (single-column UPDATE ... RETURNING, not a full-row rewrite).
+        # Record the value as already persisted so the ORM doesn't mark the
+        # row dirty and write it a second time at commit.
+        set_committed_value(user, "last_login_at", await self.user_repository.touch_last_login(user.id))
         
         # Create tokens
         tokens = security_manager.create_token_pair(
@@ -57,13 +73,13 @@ class UserAuthUseCases:
             role=user.role
         )
         
-        logger.info(f"User login successful: {user.username}")
+        logger.info("User login successful: %s", user.username)
         
         return {
             "access_token": tokens["access_token"],
             "refresh_token": tokens["refresh_token"],
             "token_type": tokens["token_type"],
-            "expires_in": security_manager.access_token_expire_minutes * 60,
+            "expires_in": security_manager.access_token_ttl_seconds,
             "user_id": user.id,
             "username": user.username,
             "role": user.role,
@@ -72,19 +88,17 @@ class UserAuthUseCases:
     
     async def register(self, request: RegisterRequest) -> Dict[str, Any]:
         """Register new user."""
-        # Check if username already exists
-        existing_user = await self.user_repository.get_by_username(request.username)
-        if existing_user:
+        # Check if username or email (if provided) already exists
+        username_taken, email_taken = await self.user_repository.get_conflicts(
+            request.username, request.email
+        )
+        if username_taken:
             raise ConflictError("Username already exists")
-        
-        # Check if email already exists (if provided)
-        if request.email:
-            existing_email = await self.user_repository.get_by_email(request.email)
-            if existing_email:
-                raise ConflictError("Email already exists")
+        if email_taken:
+            raise ConflictError("Email already exists")
         
         # Hash password
-        password_hash = get_password_hash(request.password)
+        password_hash = await ahash_password(request.password)
         
         # Create user
         user = await self.user_repository.create({
@@ -96,7 +110,7 @@ class UserAuthUseCases:
             "status": UserStatus.PENDING  # Requires admin activation
         })
         
-        logger.info(f"User registered: {user.username}")
+        logger.info("User registered: %s", user.username)
         
         return {
             "user_id": user.id,
@@ -108,32 +122,32 @@ class UserAuthUseCases:
     async def set_admin_password(self, request: SetAdminPasswordRequest) -> Dict[str, Any]:
         """Set admin password for first-time setup."""
         # 验证用户名是否匹配配置
-        if request.username != self.settings.admin_username:
+        if request.username != _ADMIN_USERNAME:
             raise ValidationError("Invalid admin username")
 
         # Check if admin user exists
-        admin_user = await self.user_repository.get_by_username(self.settings.admin_username)
+        admin_user = await self.user_repository.get_by_username(_ADMIN_USERNAME)
 
         if not admin_user:
             # Create admin user
-            password_hash = get_password_hash(request.password)
+            password_hash = await ahash_password(request.password)
             admin_user = await self.user_repository.create({
-                "username": self.settings.admin_username,
+                "username": _ADMIN_USERNAME,
                 "password_hash": password_hash,
                 "display_name": "Administrator",
                 "role": UserRole.ADMIN,
                 "status": UserStatus.ACTIVE
             })
-            logger.info(f"Admin user created: {admin_user.username}")
+            logger.info("Admin user created: %s", admin_user.username)
         else:
             # Update existing admin user (only if no password is set)
             if admin_user.password_hash:
                 raise ValidationError("Admin password is already set")
 
-            admin_user.password_hash = get_password_hash(request.password)
+            admin_user.password_hash = await ahash_password(request.password)
             admin_user.status = UserStatus.ACTIVE
             await self.user_repository.update(admin_user)
-            logger.info(f"Admin password set for: {admin_user.username}")
+            logger.info("Admin password set for: %s", admin_user.username)
 
         return {
             "message": "Admin password set successfully",
@@ -147,17 +161,12 @@ class UserAuthUseCases:
         if not payload:
             raise AuthenticationError("Invalid refresh token")
         
-        # Get user
-        user_id_str = payload.get("sub")
-        if not user_id_str:
-            raise AuthenticationError("Invalid refresh token")
-        
+        # Get user (a missing or malformed subject fails UUID parsing)
         try:
-            user_id = UUID(user_id_str)
-        except ValueError:
+            user = await self.user_repository.get_by_id(UUID(payload.get("sub")))
+        except (ValueError, TypeError):
             raise AuthenticationError("Invalid refresh token")
         
-        user = await self.user_repository.get_by_id(user_id)
         if not user or not user.is_active():
             raise AuthenticationError("User not found or inactive")
         
@@ -172,15 +181,13 @@ class UserAuthUseCases:
             "access_token": tokens["access_token"],
             "refresh_token": tokens["refresh_token"],
             "token_type": tokens["token_type"],
-            "expires_in": security_manager.access_token_expire_minutes * 60
+            "expires_in": security_manager.access_token_ttl_seconds
         }
     
     async def get_admin_status(self) -> Dict[str, Any]:
         """Get admin setup status."""
-        admin_user = await self.user_repository.get_by_username(self.settings.admin_username)
-
         return {
-            "admin_exists": bool(admin_user and admin_user.password_hash)
+            "admin_exists": await self.user_repository.admin_configured(_ADMIN_USERNAME)
         }
     
     async def get_current_user_info(self, user_id: UUID) -> Dict[str, Any]:
@@ -202,25 +209,27 @@ class UserAuthUseCases:
 
     async def update_profile(self, user_id: UUID, request: UpdateProfileRequest) -> Dict[str, Any]:
         """Update user profile."""
-        user = await self.user_repository.get_by_id(user_id)
+        # Fetch user and check if email already belongs to someone else (if provided)
+        user, email_taken = await self.user_repository.get_by_id_with_email_conflict(
+            user_id, request.email
+        )
         if not user:
             raise AuthenticationError("User not found")
+        if email_taken:
+            raise ConflictError("Email already exists")
 
-        # Check if email already exists (if provided and different from current)
-        if request.email and request.email != user.email:
-            existing_email = await self.user_repository.get_by_email(request.email)
-            if existing_email and existing_email.id != user.id:
-                raise ConflictError("Email already exists")
-
-        # Update fields
+        # Update fields (the entity is immutable, so apply them to a copy)
+        changes = {}
         if request.email is not None:
-            user.email = request.email
+            changes["email"] = request.email
         if request.display_name is not None:
-            user.display_name = request.display_name
+            changes["display_name"] = request.display_name
+        if changes:
+            user = user.model_copy(update=changes)
 
         await self.user_repository.update(user)
 
-        logger.info(f"User profile updated: {user.username}")
+        logger.info("User profile updated: %s", user.username)
 
         return {
             "message": "Profile updated successfully",
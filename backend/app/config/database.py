@@ -1,5 +1,7 @@
 """Database configuration and connection management."""
 
+from typing import AsyncGenerator
+
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
 
@@ -53,11 +55,19 @@ def get_database() -> DatabaseManager:
     return _db_manager
 
 
-async def get_db_session():
-    """FastAPI dependency for database session."""
+async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
+    """FastAPI dependency for database session.
+
+    The request is the unit of work: repositories only flush, and everything
+    they wrote is committed here once, or rolled back if the request failed.
+    """
     db_manager = get_database()
     session = await db_manager.get_session()
     try:
         yield session
+        await session.commit()
+    except Exception:
+        await session.rollback()
+        raise
     finally:
         await session.close()
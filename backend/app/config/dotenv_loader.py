@@ -0,0 +1,23 @@
+"""Single parse of the backend .env file."""
+
+import os
+from functools import cache
+from typing import Dict
+
+from dotenv import dotenv_values
+
+ENV_FILE = ".env"
+
+
+def env_file_path() -> str:
+    """Path of the .env file (backend directory is the working directory)."""
+    return os.path.join(os.getcwd(), ENV_FILE)
+
+
+@cache
+def load_dotenv_once() -> Dict[str, str]:
+    """Parse .env once and return its values (empty if the file is absent)."""
+    path = env_file_path()
+    if not os.path.exists(path):
+        return {}
+    return {k: v for k, v in dotenv_values(path).items() if v is not None}
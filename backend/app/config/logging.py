@@ -19,15 +19,19 @@ class LevelNameColorFormatter(logging.Formatter):
     }
     RESET = '\033[0m'  # 重置颜色
     
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # 预先拼好带颜色的级别名称，避免每条日志都拼接字符串
+        self._colored_levelnames = {
+            level: f"{color}{level}{self.RESET}" for level, color in self.LEVEL_COLORS.items()
+        }
+    
     def format(self, record):
         # 备份原始的 levelname
         original_levelname = record.levelname
         
-        # 如果该级别有颜色配置，就给 levelname 加上颜色
-        if record.levelname in self.LEVEL_COLORS:
-            colored_levelname = f"{self.LEVEL_COLORS[record.levelname]}{record.levelname}{self.RESET}"
-            # 临时修改 record 的 levelname
-            record.levelname = colored_levelname
+        # 如果该级别有颜色配置，就临时换成带颜色的 levelname
+        record.levelname = self._colored_levelnames.get(original_levelname, original_levelname)
         
         # 使用父类的 format 方法格式化消息
         formatted_message = super().format(record)
@@ -37,12 +41,24 @@ class LevelNameColorFormatter(logging.Formatter):
         
         return formatted_message
 
+
+class WarningOnlyFilter(logging.Filter):
+    """Pass only WARNING and above."""
+
+    def filter(self, record):
+        return record.levelno >= logging.WARNING
+
+
+_WARNING_ONLY = WarningOnlyFilter()
+
+
 def setup_logging() -> None:
     """Setup application logging configuration."""
     settings = get_settings()
 
-    # Create a more detailed formatter
-    detailed_formatter = LevelNameColorFormatter(
+    # Create a more detailed formatter; color only when writing to a terminal
+    formatter_class = LevelNameColorFormatter if sys.stdout.isatty() else logging.Formatter
+    detailed_formatter = formatter_class(
         fmt='%(levelname)s:\t%(asctime)s - [%(message)s] - %(filename)s:%(lineno)d',
         datefmt='%m-%d %H:%M:%S'
     )
@@ -94,14 +110,7 @@ def configure_loggers(log_level: str) -> None:
     for logger_name in sqlalchemy_loggers:
         logger = logging.getLogger(logger_name)
         logger.setLevel(logging.WARNING)
-        # Also disable propagation to prevent parent loggers from showing these messages
-        logger.propagate = False
-        # Re-enable propagation only for WARNING and above
-        class WarningOnlyFilter(logging.Filter):
-            def filter(self, record):
-                return record.levelno >= logging.WARNING
-        logger.addFilter(WarningOnlyFilter())
-        logger.propagate = True
+        logger.addFilter(_WARNING_ONLY)
     logging.getLogger('pyrogram').setLevel(logging.WARNING)
     logging.getLogger('pyrogram.session').setLevel(logging.ERROR)
     logging.getLogger('pyrogram.connection').setLevel(logging.ERROR)
@@ -1,85 +1,134 @@
 """Application configuration settings."""
 
-from functools import lru_cache
-from typing import Optional
+import json
+import os
+from dataclasses import dataclass, field
+from functools import cache
+from typing import Mapping, Optional
 
-from pydantic import Field, field_validator
-from pydantic_settings import BaseSettings
+from .dotenv_loader import load_dotenv_once
 
+ENV_PREFIX = "TGDRIVE_"
+LOG_LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
 
-class Settings(BaseSettings):
+
+def _optional_str(v: Optional[str]) -> Optional[str]:
+    """Strip a value; unset, blank and literal 'None' values become None."""
+    v = v and v.strip()
+    return v if v and v != 'None' else None
+
+
+def _optional_int(v: Optional[str]) -> Optional[int]:
+    """Parse an optional integer; missing or invalid values become None."""
+    v = _optional_str(v)
+    try:
+        return int(v) if v else None
+    except ValueError:
+        return None
+
+
+@dataclass(frozen=True, slots=True)
+class Settings:
     """Application settings."""
 
     # Telegram API
-    api_id: int = Field(..., description="Telegram API ID")
-    api_hash: str = Field(..., description="Telegram API Hash")
-    bot_token: str = Field(..., description="Telegram Bot Token")
+    api_id: int
+    api_hash: str
+    bot_token: str
 
     # Security
-    session_secret: str = Field(..., description="Session encryption secret")
-
-    # JWT Settings
-    jwt_secret_key: Optional[str] = Field(None, description="JWT secret key")
-    jwt_algorithm: str = Field("HS256", description="JWT algorithm")
-    access_token_expire_minutes: int = Field(30, description="Access token expiration in minutes")
+    session_secret: str
 
     # Admin Configuration
-    admin_username: str = Field(..., description="Admin username")
+    admin_username: str
 
     # Database
-    database_url: str = Field(..., description="Database connection URL")
+    database_url: str
+
+    # JWT Settings
+    jwt_secret_key: Optional[str] = None
+    jwt_algorithm: str = "HS256"
+    access_token_expire_minutes: int = 30
+    jwt_cache_size: int = 10_000  # Verified-token cache entries (0 disables)
+    jwt_cache_ttl: int = 10  # Seconds a verified token is trusted without re-checking its signature
+
+    # Password hashing (OWASP Argon2id baseline: 46 MiB, t=2, p=1)
+    password_scheme: str = "argon2"  # "argon2" or "bcrypt"
+    argon2_memory_cost: int = 46 * 1024  # KiB
+    argon2_time_cost: int = 2
+    argon2_parallelism: int = 1
 
     # Storage Channel
-    storage_channel_id: Optional[int] = Field(None, description="Storage channel ID")
-    storage_channel_username: Optional[str] = Field(None, description="Storage channel username")
+    storage_channel_id: Optional[int] = None
+    storage_channel_username: Optional[str] = None
 
     # Application
-    log_level: str = Field("INFO", description="Logging level (DEBUG, INFO, WARNING, ERROR)")
-    cors_origins: list[str] = Field(["*"], description="CORS allowed all origins")
+    log_level: str = "INFO"
+    cors_origins: list[str] = field(default_factory=lambda: ["*"])
+    login_client_pool_size: int = 0  # Pre-connected Telegram clients for phone login (0 disables)
 
-    @field_validator('storage_channel_id', mode='before')
-    @classmethod
-    def validate_storage_channel_id(cls, v) -> Optional[int]:
-        """Validate storage channel ID, handle empty strings."""
-        if v is None or v == '' or v == 'None':
-            return None
-        try:
-            return int(v)
-        except (ValueError, TypeError):
-            return None
-
-    @field_validator('storage_channel_username', mode='before')
-    @classmethod
-    def validate_storage_channel_username(cls, v) -> Optional[str]:
-        """Validate storage channel username, handle empty strings."""
-        if v is None or v == '' or v == 'None':
-            return None
-        return str(v).strip()
+    # Derived once from the storage channel settings (immutable after load)
+    storage_channel_identifier: Optional[str | int] = field(default=None, init=False)
 
-    # API token验证器已移除，因为不再使用API token认证
+    def __post_init__(self) -> None:
+        """Precompute the storage channel identifier ('@username' preferred over ID)."""
+        if self.storage_channel_username:
+            identifier = '@' + self.storage_channel_username.lstrip('@')
+        else:
+            identifier = self.storage_channel_id
+        object.__setattr__(self, "storage_channel_identifier", identifier)
 
-    @field_validator('log_level', mode='before')
     @classmethod
-    def validate_log_level(cls, v) -> str:
-        """Validate log level."""
-        if isinstance(v, str):
-            level = v.upper()
-            if level in ['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL']:
-                return level
-        return 'INFO'
-
-    class Config:
-        env_file = ".env"
-        env_prefix = "TGDRIVE_"
-        case_sensitive = False
-
-
-def _create_settings() -> Settings:
-    """Create settings instance from environment variables."""
-    return Settings()  # type: ignore[call-arg]
-
-
-@lru_cache()
+    def from_env(cls, environ: Optional[Mapping[str, str]] = None) -> "Settings":
+        """Build settings from TGDRIVE_* variables (process env over .env, case-insensitive)."""
+        if environ is None:
+            environ = os.environ
+        values = {k.upper(): v for k, v in load_dotenv_once().items()}
+        values.update({k.upper(): v for k, v in environ.items()})
+
+        def get(name: str) -> Optional[str]:
+            return values.get(ENV_PREFIX + name.upper())
+
+        def require(name: str) -> str:
+            v = get(name)
+            if v is None:
+                raise ValueError(f"Missing required setting {ENV_PREFIX}{name.upper()}")
+            return v
+
+        kwargs = {}
+        for name in ("jwt_secret_key", "jwt_algorithm", "password_scheme"):
+            if (v := get(name)) is not None:
+                kwargs[name] = v
+        for name in (
+            "access_token_expire_minutes", "jwt_cache_size", "jwt_cache_ttl", "login_client_pool_size",
+            "argon2_memory_cost", "argon2_time_cost", "argon2_parallelism",
+        ):
+            if (v := get(name)) is not None:
+                kwargs[name] = int(v)
+        if (v := get("cors_origins")) is not None:
+            kwargs["cors_origins"] = json.loads(v)
+
+        # Legacy asyncpg URLs map onto the psycopg driver
+        database_url = require("database_url").replace('+asyncpg', '+psycopg')
+
+        log_level = (get("log_level") or "INFO").upper()
+
+        return cls(
+            api_id=int(require("api_id")),
+            api_hash=require("api_hash"),
+            bot_token=require("bot_token"),
+            session_secret=require("session_secret"),
+            admin_username=require("admin_username"),
+            database_url=database_url,
+            # Invalid channel IDs are ignored rather than fatal
+            storage_channel_id=_optional_int(get("storage_channel_id")),
+            storage_channel_username=_optional_str(get("storage_channel_username")),
+            log_level=log_level if log_level in LOG_LEVELS else "INFO",
+            **kwargs,
+        )
+
+
+@cache
 def get_settings() -> Settings:
     """Get cached application settings."""
-    return _create_settings()
+    return Settings.from_env()
@@ -1,11 +1,15 @@
 """Dependency injection container."""
 
+from typing import TYPE_CHECKING
+
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..application.use_cases import AuthUseCases, FileUseCases, ChannelUseCases
 from ..infrastructure.database.repositories import UserRepositoryImpl, NodeRepositoryImpl, ChannelRepositoryImpl
-from ..infrastructure.telegram.client import telegram_client_manager
-from ..infrastructure.telegram.manager import TelegramManager
+
+# Use cases and the Telegram layer pull in Pyrogram; import them on first use
+if TYPE_CHECKING:
+    from ..application.use_cases import AuthUseCases, FileUseCases, ChannelUseCases
+    from ..infrastructure.telegram.manager import TelegramManager
 
 
 class Container:
@@ -19,9 +23,11 @@ class Container:
         self._channel_repository = None
     
     @property
-    def telegram_manager(self) -> TelegramManager:
+    def telegram_manager(self) -> "TelegramManager":
         """Get Telegram manager instance."""
         if self._telegram_manager is None:
+            from ..infrastructure.telegram.client import telegram_client_manager
+            from ..infrastructure.telegram.manager import TelegramManager
             self._telegram_manager = TelegramManager(telegram_client_manager)
         return self._telegram_manager
     
@@ -46,15 +52,18 @@ class Container:
             self._channel_repository = ChannelRepositoryImpl(self.db_session)
         return self._channel_repository
     
-    def get_auth_use_cases(self) -> AuthUseCases:
+    def get_auth_use_cases(self) -> "AuthUseCases":
         """Get auth use cases."""
+        from ..application.use_cases import AuthUseCases
+        from ..infrastructure.telegram.client import telegram_client_manager
         return AuthUseCases(
             user_repository=self.user_repository,
             telegram_manager=telegram_client_manager
         )
     
-    def get_file_use_cases(self) -> FileUseCases:
+    def get_file_use_cases(self) -> "FileUseCases":
         """Get file use cases."""
+        from ..application.use_cases import FileUseCases
         return FileUseCases(
             user_repository=self.user_repository,
             node_repository=self.node_repository,
@@ -62,8 +71,9 @@ class Container:
             telegram_manager=self.telegram_manager
         )
     
-    def get_channel_use_cases(self) -> ChannelUseCases:
+    def get_channel_use_cases(self) -> "ChannelUseCases":
         """Get channel use cases."""
+        from ..application.use_cases import ChannelUseCases
         return ChannelUseCases(
             user_repository=self.user_repository,
             channel_repository=self.channel_repository,
@@ -1,27 +1,23 @@
 """FastAPI dependencies for core functionality."""
 
-from typing import Optional, AsyncGenerator
 from uuid import UUID
 
-from fastapi import Depends, HTTPException, Header, status
+from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..config import get_settings
 from ..config.database import get_db_session
 from ..config.logging import get_logger
 from .security import verify_token
 from ..infrastructure.database.repositories import UserRepositoryImpl
-from ..infrastructure.database.models import UserModel, UserRole
+from ..infrastructure.database.models import UserModel
 
 logger = get_logger(__name__)
 
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    """Get database session dependency."""
-    async for session in get_db_session():
-        yield session
+# Database session dependency. Aliased rather than wrapped so FastAPI drives
+# get_db_session directly and request exceptions reach its rollback.
+get_db = get_db_session
 
 
 # JWT Bearer token security
@@ -55,21 +51,8 @@ async def get_current_user(
         except ValueError:
             raise credentials_exception
 
-        # Get user from database
-        user_repo = UserRepositoryImpl(db)
-        user_model = await user_repo.get_by_id(user_id)
-        if user_model is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="User not found"
-            )
-
-        # Convert to UserModel for compatibility
-        # Note: We need to return UserModel, not User entity
-        result = await db.execute(
-            select(UserModel).where(UserModel.id == user_id)
-        )
-        user = result.scalar_one_or_none()
+        # Get user from database (as UserModel, which callers expect)
+        user = await UserRepositoryImpl(db).get_model_by_id(user_id)
         if user is None:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -1,11 +1,15 @@
 """Security utilities for encryption and authentication."""
 
+import asyncio
 import base64
 import hashlib
 from datetime import datetime, timedelta, timezone
-from typing import Optional, Dict, Any
+from functools import lru_cache
+from typing import Optional, Dict, Any, Tuple
 from uuid import UUID
 
+import bcrypt
+from cachetools import TTLCache
 from cryptography.fernet import Fernet
 from jose import JWTError, jwt
 from passlib.context import CryptContext
@@ -14,8 +18,9 @@ from .exceptions import AuthenticationError
 from ..config import get_settings
 
 
+@lru_cache(maxsize=8)
 def get_fernet(secret: str) -> Fernet:
-    """Get Fernet cipher instance from secret."""
+    """Get Fernet cipher instance from secret (memoized per secret)."""
     key = secret
     if len(secret) != 44:  # urlsafe_b64 key length for Fernet
         # Derive a Fernet key from arbitrary secret by padding/truncation
@@ -41,8 +46,30 @@ def decrypt(token: str, secret: str) -> str:
         raise AuthenticationError(f"Decryption failed: {e}")
 
 
+def _create_pwd_context() -> CryptContext:
+    """Build the password hashing context from settings.
+
+    The configured scheme hashes new passwords; the other one still verifies
+    and is marked deprecated, so its hashes are upgraded on the next login.
+    """
+    settings = get_settings()
+    schemes = ["bcrypt", "argon2"] if settings.password_scheme == "bcrypt" else ["argon2", "bcrypt"]
+    return CryptContext(
+        schemes=schemes,
+        deprecated="auto",
+        argon2__type="ID",
+        argon2__time_cost=settings.argon2_time_cost,
+        argon2__memory_cost=settings.argon2_memory_cost,  # KiB
+        argon2__parallelism=settings.argon2_parallelism,
+        argon2__digest_size=32,
+        argon2__salt_size=16,
+    )
+
+
 # Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = _create_pwd_context()
+
+_BCRYPT_PREFIXES = ("$2a$", "$2b$", "$2y$")
 
 
 class SecurityManager:
@@ -51,8 +78,17 @@ class SecurityManager:
     def __init__(self):
         self.settings = get_settings()
         self.algorithm = self.settings.jwt_algorithm
+        self._algos = (self.algorithm,)  # Reused by every decode
         self.access_token_expire_minutes = self.settings.access_token_expire_minutes
+        self.access_token_ttl_seconds = self.access_token_expire_minutes * 60
         self.refresh_token_expire_days = 7
+        # Recently verified tokens (keyed by SHA-256 of the token) -> payload.
+        # Only touched from the event loop, so no lock is needed.
+        self._verify_cache: Optional[TTLCache] = (
+            TTLCache(maxsize=self.settings.jwt_cache_size, ttl=self.settings.jwt_cache_ttl)
+            if self.settings.jwt_cache_size > 0 and self.settings.jwt_cache_ttl > 0
+            else None
+        )
         # Use JWT secret key if available, otherwise fall back to session secret
         self.secret_key = self.settings.jwt_secret_key or self.settings.session_secret
 
@@ -79,33 +115,60 @@ class SecurityManager:
 
     def verify_token(self, token: str, token_type: str = "access") -> Optional[Dict[str, Any]]:
         """Verify JWT token and return payload."""
+        if self._verify_cache is None:
+            return self._decode_token(token, token_type)
+
+        # A cached payload already passed signature checks; only type and
+        # expiry need re-checking on a hit
+        cache_key = hashlib.sha256(token.encode()).digest()
+        payload = self._verify_cache.get(cache_key)
+        if payload is not None:
+            if payload["type"] != token_type or payload["exp"] < datetime.now(timezone.utc).timestamp():
+                return None
+            return payload
+
+        payload = self._decode_token(token, token_type)
+        if payload is not None:
+            self._verify_cache[cache_key] = payload
+        return payload
+
+    def _decode_token(self, token: str, token_type: str) -> Optional[Dict[str, Any]]:
+        """Decode and fully validate a JWT."""
         try:
-            payload = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
+            # jose checks the signature and requires an unexpired exp claim;
+            # ExpiredSignatureError is a JWTError
+            payload = jwt.decode(
+                token, self.secret_key, algorithms=self._algos,
+                options={"require_exp": True}
+            )
 
             # Check token type
             if payload.get("type") != token_type:
                 return None
 
-            # Check expiration
-            exp = payload.get("exp")
-            if exp is None:
-                return None
-
-            if datetime.fromtimestamp(exp, tz=timezone.utc) < datetime.now(timezone.utc):
-                return None
-
             return payload
         except JWTError:
             return None
 
     def hash_password(self, password: str) -> str:
-        """Hash password using bcrypt."""
+        """Hash password with the configured scheme."""
         return pwd_context.hash(password)
 
     def verify_password(self, plain_password: str, hashed_password: str) -> bool:
         """Verify password against hash."""
         return pwd_context.verify(plain_password, hashed_password)
 
+    def verify_and_update_password(self, plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """Verify password; also return a new hash if the stored one is outdated."""
+        if self.settings.password_scheme != "bcrypt" and hashed_password.startswith(_BCRYPT_PREFIXES):
+            # Legacy hashes are checked with bcrypt itself: passlib 1.7.4's bcrypt
+            # backend self-test fails on newer bcrypt releases. bcrypt only ever
+            # used the first 72 bytes, so truncate as passlib did.
+            if not bcrypt.checkpw(plain_password.encode()[:72], hashed_password.encode()):
+                return False, None
+            return True, pwd_context.hash(plain_password)
+        return pwd_context.verify_and_update(plain_password, hashed_password)
+
     def create_token_pair(self, user_id: UUID, username: str, role: str) -> Dict[str, str]:
         """Create access and refresh token pair."""
         token_data = {
@@ -138,6 +201,25 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return security_manager.verify_password(plain_password, hashed_password)
 
 
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verify password and return a replacement hash when rehashing is due."""
+    return security_manager.verify_and_update_password(plain_password, hashed_password)
+
+
+# Async variants: the KDF is CPU-bound (tens of ms), so run it in the default
+# executor instead of blocking the event loop.
+async def ahash_password(password: str) -> str:
+    """Hash password in the default executor."""
+    return await asyncio.get_running_loop().run_in_executor(None, get_password_hash, password)
+
+
+async def averify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verify password (and compute any rehash) in the default executor."""
+    return await asyncio.get_running_loop().run_in_executor(
+        None, verify_and_update_password, plain_password, hashed_password
+    )
+
+
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     """Create access token."""
     return security_manager.create_access_token(data, expires_delta)
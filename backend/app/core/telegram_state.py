@@ -1,48 +1,104 @@
 """Telegram state management for maintaining pending logins across requests."""
 
-from typing import Dict, Optional
+import asyncio
+from typing import Awaitable, Iterable, List, Optional
+
+from cachetools import TTLCache
 from pyrogram.client import Client
 
+# Abandoned login flows are dropped (and their clients disconnected) after this
+_PENDING_LOGIN_TTL = 600.0
+_MAX_PENDING_LOGINS = 1024
+# Upper bound on concurrent disconnects during bulk cleanup
+_CLEANUP_CONCURRENCY = 16
+
+
+class _PendingLoginCache(TTLCache):
+    """TTL cache that keeps evicted clients around until they are disconnected."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        super().__init__(maxsize=maxsize, ttl=ttl)
+        self.evicted: List[Client] = []
+
+    def popitem(self):
+        key, client = super().popitem()
+        self.evicted.append(client)
+        return key, client
+
+    def expire(self, time=None):
+        expired = super().expire(time)
+        self.evicted.extend(client for _, client in expired)
+        return expired
+
+
+async def _disconnect(client: Client) -> None:
+    """Disconnect a client, ignoring errors."""
+    try:
+        await client.disconnect()
+    except Exception:
+        pass
+
+
+async def _gather_bounded(aws: Iterable[Awaitable[None]]) -> None:
+    """Await all, running at most _CLEANUP_CONCURRENCY at a time."""
+    semaphore = asyncio.Semaphore(_CLEANUP_CONCURRENCY)
+
+    async def run(aw: Awaitable[None]) -> None:
+        async with semaphore:
+            await aw
+
+    await asyncio.gather(*(run(aw) for aw in aws), return_exceptions=True)
+
 
 class TelegramStateManager:
     """Manages Telegram client state across API requests."""
-    
+
     def __init__(self):
-        self._pending_logins: Dict[str, Client] = {}
-    
-    def add_pending_login(self, phone: str, client: Client) -> None:
+        self._pending_logins = _PendingLoginCache(_MAX_PENDING_LOGINS, _PENDING_LOGIN_TTL)
+
+    async def _disconnect_evicted(self) -> None:
+        """Disconnect clients dropped by expiry or size pressure."""
+        self._pending_logins.expire()
+        evicted, self._pending_logins.evicted = self._pending_logins.evicted, []
+        if evicted:
+            await _gather_bounded(_disconnect(client) for client in evicted)
+
+    async def add_pending_login(self, phone: str, client: Client) -> None:
         """Add a pending login client for a phone number."""
+        previous = self._pending_logins.pop(phone, None)
         self._pending_logins[phone] = client
-    
+        if previous is not None and previous is not client:
+            await _disconnect(previous)
+        await self._disconnect_evicted()
+
     def get_pending_login(self, phone: str) -> Optional[Client]:
         """Get a pending login client for a phone number."""
         return self._pending_logins.get(phone)
-    
+
     def remove_pending_login(self, phone: str) -> Optional[Client]:
         """Remove and return a pending login client for a phone number."""
         return self._pending_logins.pop(phone, None)
-    
+
     def has_pending_login(self, phone: str) -> bool:
         """Check if there's a pending login for a phone number."""
         return phone in self._pending_logins
-    
+
     def get_pending_phones(self) -> list:
         """Get list of phones with pending logins."""
         return list(self._pending_logins.keys())
-    
+
     async def cleanup_pending_login(self, phone: str) -> None:
         """Cleanup a pending login client."""
         client = self.remove_pending_login(phone)
         if client:
-            try:
-                await client.disconnect()
-            except Exception:
-                pass
-    
+            await _disconnect(client)
+
     async def cleanup_all(self) -> None:
         """Cleanup all pending login clients."""
-        for phone in list(self._pending_logins.keys()):
-            await self.cleanup_pending_login(phone)
+        await _gather_bounded(
+            self.cleanup_pending_login(phone) for phone in list(self._pending_logins.keys())
+        )
+        await self._disconnect_evicted()
 
 
 # Global instance
@@ -1,5 +1,5 @@
 from .user import User
-from .node import Node, NodeType
+from .node import Node, NodeType, path_depth
 from .channel import TelegramChannel
 
-__all__ = ["User", "Node", "NodeType", "TelegramChannel"]
+__all__ = ["User", "Node", "NodeType", "path_depth", "TelegramChannel"]
@@ -4,7 +4,7 @@ from datetime import datetime
 from typing import Optional
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 class TelegramChannel(BaseModel):
@@ -15,10 +15,10 @@ class TelegramChannel(BaseModel):
     channel_id: int  # Telegram channel ID (e.g., -100xxxxxxxxxx)
     username: Optional[str] = None  # Channel username (e.g., @channelname)
     title: Optional[str] = None
-    created_at: datetime
+    created_at: Optional[datetime] = None  # Set by database on insert
     
-    class Config:
-        from_attributes = True
+    # Immutable: mutators return updated copies
+    model_config = ConfigDict(from_attributes=True, frozen=True)
     
     def has_username(self) -> bool:
         """Check if channel has a username."""
@@ -40,9 +40,11 @@ class TelegramChannel(BaseModel):
             return self.username
         return self.channel_id
     
-    def update_info(self, title: Optional[str] = None, username: Optional[str] = None) -> None:
-        """Update channel information."""
+    def update_info(self, title: Optional[str] = None, username: Optional[str] = None) -> "TelegramChannel":
+        """Return a copy with the given channel information updated."""
+        changes = {}
         if title is not None:
-            self.title = title
+            changes["title"] = title
         if username is not None:
-            self.username = username
+            changes["username"] = username
+        return self.model_copy(update=changes) if changes else self
@@ -1,11 +1,20 @@
 """Node domain entity for files and directories."""
 
-from datetime import datetime
+from datetime import datetime, timezone
 from enum import Enum
 from typing import Optional
 from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+
+_SIZE_UNITS = ("B", "KB", "MB", "GB", "TB")
+_UTC = timezone.utc
+_now = datetime.now
+
+
+def path_depth(path: str) -> int:
+    """Number of segments in a normalized absolute path ('/' is depth 0)."""
+    return path.count("/") if path != "/" else 0
 
 
 class NodeType(str, Enum):
@@ -38,8 +47,8 @@ class Node(BaseModel):
     updated_at: datetime
     deleted_at: Optional[datetime] = None
     
-    class Config:
-        from_attributes = True
+    # Immutable: mutators return updated copies
+    model_config = ConfigDict(from_attributes=True, frozen=True)
     
     def is_file(self) -> bool:
         """Check if node is a file."""
@@ -57,52 +66,42 @@ class Node(BaseModel):
         """Check if node is root (no parent)."""
         return self.parent_id is None
     
-    def soft_delete(self) -> None:
-        """Soft delete the node."""
-        self.deleted_at = datetime.utcnow()
-        self.updated_at = datetime.utcnow()
+    def soft_delete(self) -> "Node":
+        """Return a soft-deleted copy of the node."""
+        now = _now(_UTC)
+        return self.model_copy(update={"deleted_at": now, "updated_at": now})
     
-    def restore(self) -> None:
-        """Restore soft-deleted node."""
-        self.deleted_at = None
-        self.updated_at = datetime.utcnow()
+    def restore(self) -> "Node":
+        """Return a restored copy of the node."""
+        return self.model_copy(update={"deleted_at": None, "updated_at": _now(_UTC)})
     
-    def rename(self, new_name: str) -> None:
-        """Rename the node."""
-        self.name = new_name
-        self.updated_at = datetime.utcnow()
+    def rename(self, new_name: str) -> "Node":
+        """Return a renamed copy of the node."""
+        return self.model_copy(update={"name": new_name, "updated_at": _now(_UTC)})
     
-    def move(self, new_parent_id: Optional[UUID], new_path: str, new_depth: int) -> None:
-        """Move node to new parent."""
-        self.parent_id = new_parent_id
-        self.path = new_path
-        self.depth = new_depth
-        self.updated_at = datetime.utcnow()
+    def move(self, new_parent_id: Optional[UUID], new_path: str, new_depth: int) -> "Node":
+        """Return a copy of the node moved to a new parent."""
+        return self.model_copy(update={
+            "parent_id": new_parent_id,
+            "path": new_path,
+            "depth": new_depth,
+            "updated_at": _now(_UTC),
+        })
     
     def get_file_extension(self) -> Optional[str]:
         """Get file extension if it's a file."""
         if not self.is_file():
             return None
         
-        if "." not in self.name:
-            return None
-        
-        return self.name.split(".")[-1].lower()
+        _, sep, ext = self.name.rpartition(".")
+        return ext.lower() if sep and ext else None
     
     def format_size(self) -> str:
         """Format file size in human readable format."""
-        if self.size_bytes == 0:
-            return "0 B"
-        
-        units = ["B", "KB", "MB", "GB", "TB"]
-        size = float(self.size_bytes)
-        unit_index = 0
-        
-        while size >= 1024 and unit_index < len(units) - 1:
-            size /= 1024
-            unit_index += 1
+        size = self.size_bytes
+        if size < 1024:
+            return f"{size} B"
         
-        if unit_index == 0:
-            return f"{int(size)} {units[unit_index]}"
-        else:
-            return f"{size:.1f} {units[unit_index]}"
+        # bit_length() picks the 1024-power directly instead of dividing in a loop
+        unit_index = min((size.bit_length() - 1) // 10, len(_SIZE_UNITS) - 1)
+        return f"{size / (1 << (10 * unit_index)):.1f} {_SIZE_UNITS[unit_index]}"
@@ -1,10 +1,13 @@
 """User domain entity."""
 
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
+
+_UTC = timezone.utc
+_now = datetime.now
 
 
 class User(BaseModel):
@@ -21,13 +24,12 @@ class User(BaseModel):
     updated_at: datetime
     last_login_at: Optional[datetime] = None
 
-    class Config:
-        from_attributes = True
+    # Immutable: mutators return updated copies
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
-    def update_username(self, username: Optional[str]) -> None:
-        """Update user's username."""
-        self.username = username
-        self.updated_at = datetime.utcnow()
+    def update_username(self, username: Optional[str]) -> "User":
+        """Return a copy with the username updated."""
+        return self.model_copy(update={"username": username, "updated_at": _now(_UTC)})
 
     def is_anonymous(self) -> bool:
         """Check if user is anonymous (no username)."""
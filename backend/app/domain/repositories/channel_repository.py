@@ -35,6 +35,11 @@ class ChannelRepository(ABC):
         """Create new channel."""
         pass
     
+    @abstractmethod
+    async def upsert_by_user_and_channel_id(self, channel: TelegramChannel) -> TelegramChannel:
+        """Create channel, or return the existing one for the same user and channel ID."""
+        pass
+    
     @abstractmethod
     async def update(self, channel: TelegramChannel) -> TelegramChannel:
         """Update existing channel."""
@@ -21,8 +21,13 @@ class NodeRepository(ABC):
         pass
     
     @abstractmethod
-    async def get_by_checksum(self, user_id: UUID, checksum: str) -> Optional[Node]:
-        """Get file node by checksum."""
+    async def get_by_size_and_checksum(self, user_id: UUID, size_bytes: int, checksum: str) -> Optional[Node]:
+        """Get file node by size and checksum."""
+        pass
+    
+    @abstractmethod
+    async def exists_any_with_size(self, user_id: UUID, size_bytes: int) -> bool:
+        """Check if any file node has the given size."""
         pass
     
     @abstractmethod
@@ -62,5 +67,5 @@ class NodeRepository(ABC):
     
     @abstractmethod
     async def move_node(self, node_id: UUID, new_parent_id: Optional[UUID], new_path: str) -> bool:
-        """Move node to new parent."""
+        """Move node to new parent, rewriting the paths of everything under it."""
         pass
@@ -10,6 +10,9 @@ from ..entities import User
 class UserRepository(ABC):
     """Abstract user repository interface."""
     
+    # No instance __dict__, so slotted implementations stay dict-free
+    __slots__ = ()
+    
     @abstractmethod
     async def get_by_id(self, user_id: UUID) -> Optional[User]:
         """Get user by ID."""
@@ -5,7 +5,7 @@ from typing import Optional
 from uuid import UUID
 from enum import Enum
 
-from sqlalchemy import String, Integer, ForeignKey, BigInteger, UniqueConstraint, Text, CheckConstraint, DateTime, text, Boolean
+from sqlalchemy import String, Integer, ForeignKey, BigInteger, UniqueConstraint, Text, CheckConstraint, DateTime, text, Boolean, Index
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -25,11 +25,16 @@ class UserStatus(str, Enum):
     PENDING = "pending"
 
 
+# Raw values for hot-path checks (columns hold plain strings)
+_ADMIN = UserRole.ADMIN.value
+_ACTIVE = UserStatus.ACTIVE.value
+
+
 class UserModel(Base):
     """User database model."""
     __tablename__ = "users"
 
-    id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), primary_key=True, server_default=text('gen_random_uuid()'))
+    id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), primary_key=True, server_default=text('uuidv7()'))
 
     # Authentication fields
     username: Mapped[Optional[str]] = mapped_column(String(255), nullable=True, unique=True, index=True)
@@ -61,11 +66,11 @@ class UserModel(Base):
 
     def is_admin(self) -> bool:
         """Check if user is admin."""
-        return self.role == UserRole.ADMIN
+        return self.role == _ADMIN
 
     def is_active(self) -> bool:
         """Check if user is active."""
-        return self.status == UserStatus.ACTIVE
+        return self.status == _ACTIVE
 
 
 class TelegramSessionModel(Base):
@@ -118,7 +123,7 @@ class NodeModel(Base):
     """Node database model for files and directories."""
     __tablename__ = "nodes"
 
-    id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), primary_key=True, server_default=text('gen_random_uuid()'))
+    id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), primary_key=True, server_default=text('uuidv7()'))
     user_id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"))
     parent_id: Mapped[Optional[UUID]] = mapped_column(PG_UUID(as_uuid=True), ForeignKey("nodes.id", ondelete="RESTRICT"), nullable=True)
     name: Mapped[str] = mapped_column(Text)
@@ -145,4 +150,27 @@ class NodeModel(Base):
 
     __table_args__ = (
         CheckConstraint("kind IN ('folder', 'file')", name="check_node_kind"),
+        Index(
+            "idx_nodes_parent_live", "parent_id", "user_id",
+            postgresql_using="btree",
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+        Index(
+            "idx_nodes_user_size_checksum", "user_id", "size_bytes", "checksum",
+            postgresql_where=text("checksum IS NOT NULL AND deleted_at IS NULL"),
+        ),
+        Index(
+            "idx_nodes_user_lowername", "user_id", text("lower(name)"),
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+        Index(
+            "idx_nodes_user_path", "user_id", "path",
+            postgresql_ops={"path": "text_pattern_ops"},
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+        Index(
+            "uq_nodes_user_folder_path_live", "user_id", "path",
+            unique=True,
+            postgresql_where=text("kind = 'folder' AND deleted_at IS NULL"),
+        ),
     )
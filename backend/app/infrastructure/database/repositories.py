@@ -1,39 +1,70 @@
 """Repository implementations using SQLAlchemy."""
 
-from datetime import datetime, timezone
-from typing import Optional, List, Dict, Any
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional, List, Dict, Any, Tuple
 from uuid import UUID
 
-from sqlalchemy import select, update, delete, and_, or_
+from sqlalchemy import select, update, delete, exists, and_, or_, func, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload
 
+from ...config import get_settings
 from ...config.logging import get_logger
-from ...domain.entities import User, Node, NodeType, TelegramChannel
+from ...domain.entities import User, Node, NodeType, TelegramChannel, path_depth
 from ...domain.repositories import UserRepository, NodeRepository, ChannelRepository
 from ...core.exceptions import NotFoundError
 from .models import UserModel, NodeModel, TelegramChannelModel
 
 logger = get_logger(__name__)
 
+# In DEBUG, make any relationship access on loaded rows raise instead of
+# lazy-loading, so N+1 patterns surface during development
+_LOAD_OPTIONS = (raiseload("*"),) if get_settings().log_level == "DEBUG" else ()
 
+# Single-user mode resolves the same user on every request; keep it briefly
+# across sessions. Cleared by any user create/update/delete in this process.
+_SINGLE_USER_TTL = 60.0
+_single_user_cache: Optional[Tuple[float, User]] = None
+
+
+def _invalidate_single_user() -> None:
+    global _single_user_cache
+    _single_user_cache = None
+
+
+def _like_prefix(prefix: str) -> str:
+    """LIKE pattern matching strings that start with prefix.
+
+    Escapes with the default backslash so the planner can still turn the
+    pattern into an index range scan (an ESCAPE clause would prevent that).
+    """
+    escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return escaped + "%"
+
+
+@dataclass(slots=True)
 class UserRepositoryImpl(UserRepository):
     """User repository implementation."""
     
-    def __init__(self, session: AsyncSession):
-        self.session = session
+    session: AsyncSession
     
     async def get_by_id(self, user_id: UUID) -> Optional[User]:
         """Get user by ID."""
-        result = await self.session.execute(
-            select(UserModel).where(UserModel.id == user_id)
-        )
-        model = result.scalar_one_or_none()
+        # Primary-key lookup is served from the identity map when already loaded
+        model = await self.session.get(UserModel, user_id, options=_LOAD_OPTIONS)
         return self._to_entity(model) if model else None
     
+    async def get_model_by_id(self, user_id: UUID) -> Optional[UserModel]:
+        """Get user ORM model by ID."""
+        return await self.session.get(UserModel, user_id, options=_LOAD_OPTIONS)
+    
     async def get_first(self) -> Optional[User]:
         """Get first user (for single-user mode)."""
         result = await self.session.execute(
-            select(UserModel).limit(1)
+            select(UserModel).options(*_LOAD_OPTIONS).limit(1)
         )
         model = result.scalar_one_or_none()
         return self._to_entity(model) if model else None
@@ -41,26 +72,66 @@ class UserRepositoryImpl(UserRepository):
     async def get_by_username(self, username: str) -> Optional[UserModel]:
         """Get user by username."""
         result = await self.session.execute(
-            select(UserModel).where(UserModel.username == username)
+            select(UserModel).options(*_LOAD_OPTIONS).where(UserModel.username == username)
         )
         return result.scalar_one_or_none()
 
     async def get_by_email(self, email: str) -> Optional[UserModel]:
         """Get user by email."""
         result = await self.session.execute(
-            select(UserModel).where(UserModel.email == email)
+            select(UserModel).options(*_LOAD_OPTIONS).where(UserModel.email == email)
         )
         return result.scalar_one_or_none()
 
     async def get_by_username_or_email(self, identifier: str) -> Optional[UserModel]:
         """Get user by username or email."""
         result = await self.session.execute(
-            select(UserModel).where(
+            select(UserModel).options(*_LOAD_OPTIONS).where(
                 or_(UserModel.username == identifier, UserModel.email == identifier)
             )
         )
         return result.scalar_one_or_none()
     
+    async def admin_configured(self, username: str) -> bool:
+        """Check whether the admin user exists and has a password set."""
+        return bool(await self.session.scalar(
+            select(
+                exists().where(
+                    and_(UserModel.username == username, UserModel.password_hash.is_not(None))
+                )
+            )
+        ))
+
+    async def get_conflicts(self, username: Optional[str], email: Optional[str]) -> Tuple[bool, bool]:
+        """Check whether username and email are already taken (single query)."""
+        conditions = []
+        if username:
+            conditions.append(UserModel.username == username)
+        if email:
+            conditions.append(UserModel.email == email)
+        if not conditions:
+            return False, False
+
+        result = await self.session.execute(
+            select(UserModel.username, UserModel.email).where(or_(*conditions))
+        )
+        rows = result.all()
+        username_taken = bool(username) and any(row.username == username for row in rows)
+        email_taken = bool(email) and any(row.email == email for row in rows)
+        return username_taken, email_taken
+
+    async def get_by_id_with_email_conflict(self, user_id: UUID, email: Optional[str]) -> Tuple[Optional[User], bool]:
+        """Get user by ID and whether another user has the email (single query)."""
+        condition = UserModel.id == user_id
+        if email:
+            condition = or_(condition, UserModel.email == email)
+
+        result = await self.session.execute(select(UserModel).options(*_LOAD_OPTIONS).where(condition))
+        models = result.scalars().all()
+        user = next((m for m in models if m.id == user_id), None)
+        email_taken = any(m.id != user_id for m in models)
+        return (self._to_entity(user) if user else None), email_taken
+    
     async def create(self, user_data: Optional[Dict[str, Any]] = None, username: Optional[str] = None) -> UserModel:
         """Create new user."""
         if user_data:
@@ -72,8 +143,7 @@ class UserRepositoryImpl(UserRepository):
 
         self.session.add(model)
         await self.session.flush()
-        await self.session.refresh(model)
-        await self.session.commit()
+        _invalidate_single_user()
         return model
     
     async def update(self, user: UserModel) -> UserModel:
@@ -89,30 +159,46 @@ class UserRepositoryImpl(UserRepository):
                 role=user.role,
                 status=user.status,
                 last_login_at=user.last_login_at,
-                updated_at=datetime.now(timezone.utc)
+                updated_at=func.now()
             )
         )
-        await self.session.commit()
+        _invalidate_single_user()
         return user
     
+    async def touch_last_login(self, user_id: UUID) -> Optional[datetime]:
+        """Stamp last login time with the database clock and return it."""
+        result = await self.session.execute(
+            update(UserModel)
+            .where(UserModel.id == user_id)
+            .values(last_login_at=func.now())
+            .returning(UserModel.last_login_at)
+        )
+        last_login_at = result.scalar_one_or_none()
+        _invalidate_single_user()
+        return last_login_at
+    
     async def delete(self, user_id: UUID) -> bool:
         """Delete user."""
         result = await self.session.execute(
             delete(UserModel).where(UserModel.id == user_id)
         )
-        await self.session.commit()
+        _invalidate_single_user()
         return result.rowcount > 0
     
     async def get_or_create_single_user(self) -> User:
         """Get or create single user for single-user mode."""
+        global _single_user_cache
+        if _single_user_cache and time.monotonic() - _single_user_cache[0] < _SINGLE_USER_TTL:
+            return _single_user_cache[1]
         user = await self.get_first()
         if user:
+            _single_user_cache = (time.monotonic(), user)
             return user
         return await self.create()
     
     def _to_entity(self, model: UserModel) -> User:
-        """Convert model to entity."""
-        return User(
+        """Convert model to entity (trusted DB row, so skip validation)."""
+        return User.model_construct(
             id=model.id,
             username=model.username,
             email=model.email,
@@ -135,7 +221,7 @@ class NodeRepositoryImpl(NodeRepository):
     async def get_by_id(self, node_id: UUID) -> Optional[Node]:
         """Get node by ID."""
         result = await self.session.execute(
-            select(NodeModel).where(
+            select(NodeModel).options(*_LOAD_OPTIONS).where(
                 and_(NodeModel.id == node_id, NodeModel.deleted_at.is_(None))
             )
         )
@@ -144,7 +230,7 @@ class NodeRepositoryImpl(NodeRepository):
 
     async def get_by_path(self, user_id: UUID, path: str, kind: Optional[NodeType] = None) -> Optional[Node]:
         """Get node by path."""
-        query = select(NodeModel).where(
+        query = select(NodeModel).options(*_LOAD_OPTIONS).where(
             and_(
                 NodeModel.user_id == user_id,
                 NodeModel.path == path,
@@ -158,13 +244,14 @@ class NodeRepositoryImpl(NodeRepository):
         model = result.scalar_one_or_none()
         return self._to_entity(model) if model else None
 
-    async def get_by_checksum(self, user_id: UUID, checksum: str) -> Optional[Node]:
-        """Get file node by checksum."""
+    async def get_by_size_and_checksum(self, user_id: UUID, size_bytes: int, checksum: str) -> Optional[Node]:
+        """Get file node by size and checksum."""
         result = await self.session.execute(
-            select(NodeModel).where(
+            select(NodeModel).options(*_LOAD_OPTIONS).where(
                 and_(
                     NodeModel.user_id == user_id,
                     NodeModel.kind == NodeType.FILE.value,
+                    NodeModel.size_bytes == size_bytes,
                     NodeModel.checksum == checksum,
                     NodeModel.deleted_at.is_(None)
                 )
@@ -173,10 +260,26 @@ class NodeRepositoryImpl(NodeRepository):
         model = result.scalar_one_or_none()
         return self._to_entity(model) if model else None
 
+    async def exists_any_with_size(self, user_id: UUID, size_bytes: int) -> bool:
+        """Check if any file node has the given size."""
+        # Only files carry a checksum; filtering on it instead of kind keeps
+        # the probe inside the partial (user_id, size_bytes, checksum) index
+        result = await self.session.execute(
+            select(NodeModel.id).where(
+                and_(
+                    NodeModel.user_id == user_id,
+                    NodeModel.size_bytes == size_bytes,
+                    NodeModel.checksum.is_not(None),
+                    NodeModel.deleted_at.is_(None)
+                )
+            ).limit(1)
+        )
+        return result.scalar_one_or_none() is not None
+
     async def get_children(self, user_id: UUID, parent_id: Optional[UUID]) -> List[Node]:
         """Get child nodes."""
         result = await self.session.execute(
-            select(NodeModel).where(
+            select(NodeModel).options(*_LOAD_OPTIONS).where(
                 and_(
                     NodeModel.user_id == user_id,
                     NodeModel.parent_id == parent_id,
@@ -205,8 +308,6 @@ class NodeRepositoryImpl(NodeRepository):
         )
         self.session.add(model)
         await self.session.flush()
-        await self.session.refresh(model)
-        await self.session.commit()
         return self._to_entity(model)
 
     async def update(self, node: Node) -> Node:
@@ -225,11 +326,10 @@ class NodeRepositoryImpl(NodeRepository):
                 checksum=node.checksum,
                 telegram_channel_id=node.telegram_channel_id,
                 telegram_message_id=node.telegram_message_id,
-                updated_at=datetime.utcnow(),
+                updated_at=func.now(),
                 deleted_at=node.deleted_at
             )
         )
-        await self.session.commit()
         return node
 
     async def soft_delete(self, node_id: UUID) -> bool:
@@ -237,9 +337,8 @@ class NodeRepositoryImpl(NodeRepository):
         result = await self.session.execute(
             update(NodeModel)
             .where(NodeModel.id == node_id)
-            .values(deleted_at=datetime.utcnow(), updated_at=datetime.utcnow())
+            .values(deleted_at=func.now(), updated_at=func.now())
         )
-        await self.session.commit()
         return result.rowcount > 0
 
     async def restore(self, node_id: UUID) -> bool:
@@ -247,9 +346,8 @@ class NodeRepositoryImpl(NodeRepository):
         result = await self.session.execute(
             update(NodeModel)
             .where(NodeModel.id == node_id)
-            .values(deleted_at=None, updated_at=datetime.utcnow())
+            .values(deleted_at=None, updated_at=func.now())
         )
-        await self.session.commit()
         return result.rowcount > 0
 
     async def hard_delete(self, node_id: UUID) -> bool:
@@ -257,7 +355,6 @@ class NodeRepositoryImpl(NodeRepository):
         result = await self.session.execute(
             delete(NodeModel).where(NodeModel.id == node_id)
         )
-        await self.session.commit()
         return result.rowcount > 0
 
     async def ensure_directory_path(self, user_id: UUID, path: str) -> Optional[UUID]:
@@ -266,61 +363,105 @@ class NodeRepositoryImpl(NodeRepository):
         if path == "/":
             return None
 
-        # Check if directory already exists
-        existing = await self.get_by_path(user_id, path, NodeType.FOLDER)
-        if existing:
-            return existing.id
-
-        # Create directory tree
         parts = [p for p in path.split("/") if p]
-        current_path = ""
-        parent_id = None
+        prefixes = ["/" + "/".join(parts[:i + 1]) for i in range(len(parts))]
 
-        for i, part in enumerate(parts):
-            current_path = "/" + "/".join(parts[:i+1])
-
-            # Check if this level exists
-            existing = await self.get_by_path(user_id, current_path, NodeType.FOLDER)
-            if existing:
-                parent_id = existing.id
-            else:
-                # Create this directory level
-                from uuid import uuid4
-                node = Node(
-                    id=uuid4(),
-                    user_id=user_id,
-                    parent_id=parent_id,
-                    name=part,
-                    kind=NodeType.FOLDER,
-                    path=current_path,
-                    depth=i + 1,
-                    sort_key=0,
-                    size_bytes=0,
-                    created_at=datetime.utcnow(),
-                    updated_at=datetime.utcnow()
+        # One round-trip resolves every existing level of the path
+        result = await self.session.execute(
+            select(NodeModel.path, NodeModel.id).where(
+                NodeModel.user_id == user_id,
+                NodeModel.path.in_(prefixes),
+                NodeModel.kind == NodeType.FOLDER.value,
+                NodeModel.deleted_at.is_(None),
+            )
+        )
+        existing = dict(result.all())
+        if path in existing:
+            return existing[path]
+
+        # Create the missing levels top-down; ON CONFLICT makes a concurrent
+        # creator of the same folder a no-op instead of a duplicate
+        parent_id = None
+        for depth, (part, current_path) in enumerate(zip(parts, prefixes), start=1):
+            node_id = existing.get(current_path)
+            if node_id is None:
+                node_id = await self.session.scalar(
+                    pg_insert(NodeModel)
+                    .values(
+                        user_id=user_id,
+                        parent_id=parent_id,
+                        name=part,
+                        kind=NodeType.FOLDER.value,
+                        path=current_path,
+                        depth=depth,
+                    )
+                    .on_conflict_do_nothing(
+                        index_elements=[NodeModel.user_id, NodeModel.path],
+                        index_where=text("kind = 'folder' AND deleted_at IS NULL"),
+                    )
+                    .returning(NodeModel.id)
                 )
-                created_node = await self.create(node)
-                parent_id = created_node.id
+                if node_id is None:
+                    # Lost the race: another request created it first
+                    node_id = await self.session.scalar(
+                        select(NodeModel.id).where(
+                            NodeModel.user_id == user_id,
+                            NodeModel.path == current_path,
+                            NodeModel.kind == NodeType.FOLDER.value,
+                            NodeModel.deleted_at.is_(None),
+                        )
+                    )
+            parent_id = node_id
 
         return parent_id
 
     async def move_node(self, node_id: UUID, new_parent_id: Optional[UUID], new_path: str) -> bool:
-        """Move node to new parent."""
-        # Calculate new depth
-        new_depth = len([p for p in new_path.split("/") if p])
+        """Move node to new parent, rewriting the paths of everything under it.
+
+        The node's name is taken from the last segment of new_path, so this
+        also covers renames.
+        """
+        new_depth = path_depth(new_path)
 
+        # Update the node itself, reading back its pre-move path and depth
+        old = (
+            select(NodeModel.id, NodeModel.path, NodeModel.depth)
+            .where(NodeModel.id == node_id)
+            .subquery()
+        )
         result = await self.session.execute(
             update(NodeModel)
-            .where(NodeModel.id == node_id)
+            .where(NodeModel.id == old.c.id)
             .values(
                 parent_id=new_parent_id,
+                name=new_path.rpartition("/")[2],
                 path=new_path,
                 depth=new_depth,
-                updated_at=datetime.utcnow()
+                updated_at=func.now()
             )
+            .returning(NodeModel.user_id, NodeModel.kind, old.c.path, old.c.depth)
         )
-        await self.session.commit()
-        return result.rowcount > 0
+        row = result.one_or_none()
+        if row is None:
+            return False
+
+        user_id, kind, old_path, old_depth = row
+        if kind == NodeType.FOLDER.value and old_path != new_path:
+            # One statement re-prefixes the whole live subtree
+            await self.session.execute(
+                update(NodeModel)
+                .where(
+                    NodeModel.user_id == user_id,
+                    NodeModel.path.like(_like_prefix(old_path + "/")),
+                    NodeModel.deleted_at.is_(None),
+                )
+                .values(
+                    path=new_path + func.substr(NodeModel.path, len(old_path) + 1),
+                    depth=NodeModel.depth + (new_depth - (old_depth or 0)),
+                    updated_at=func.now()
+                )
+            )
+        return True
 
     def _normalize_path(self, path: str) -> str:
         """Normalize directory path."""
@@ -333,8 +474,8 @@ class NodeRepositoryImpl(NodeRepository):
         return p
 
     def _to_entity(self, model: NodeModel) -> Node:
-        """Convert model to entity."""
-        return Node(
+        """Convert model to entity (trusted DB row, so skip validation)."""
+        return Node.model_construct(
             id=model.id,
             user_id=model.user_id,
             parent_id=model.parent_id,
@@ -363,7 +504,7 @@ class ChannelRepositoryImpl(ChannelRepository):
     async def get_by_id(self, channel_id: int) -> Optional[TelegramChannel]:
         """Get channel by ID."""
         result = await self.session.execute(
-            select(TelegramChannelModel).where(TelegramChannelModel.id == channel_id)
+            select(TelegramChannelModel).options(*_LOAD_OPTIONS).where(TelegramChannelModel.id == channel_id)
         )
         model = result.scalar_one_or_none()
         return self._to_entity(model) if model else None
@@ -371,7 +512,7 @@ class ChannelRepositoryImpl(ChannelRepository):
     async def get_by_user_and_channel_id(self, user_id: UUID, channel_id: int) -> Optional[TelegramChannel]:
         """Get channel by user and channel ID."""
         result = await self.session.execute(
-            select(TelegramChannelModel).where(
+            select(TelegramChannelModel).options(*_LOAD_OPTIONS).where(
                 and_(
                     TelegramChannelModel.user_id == user_id,
                     TelegramChannelModel.channel_id == channel_id
@@ -384,7 +525,7 @@ class ChannelRepositoryImpl(ChannelRepository):
     async def get_latest_for_user(self, user_id: UUID) -> Optional[TelegramChannel]:
         """Get latest channel for user."""
         result = await self.session.execute(
-            select(TelegramChannelModel)
+            select(TelegramChannelModel).options(*_LOAD_OPTIONS)
             .where(TelegramChannelModel.user_id == user_id)
             .order_by(TelegramChannelModel.id.desc())
             .limit(1)
@@ -395,7 +536,7 @@ class ChannelRepositoryImpl(ChannelRepository):
     async def get_all_for_user(self, user_id: UUID) -> List[TelegramChannel]:
         """Get all channels for user."""
         result = await self.session.execute(
-            select(TelegramChannelModel)
+            select(TelegramChannelModel).options(*_LOAD_OPTIONS)
             .where(TelegramChannelModel.user_id == user_id)
             .order_by(TelegramChannelModel.created_at.desc())
         )
@@ -412,8 +553,22 @@ class ChannelRepositoryImpl(ChannelRepository):
         )
         self.session.add(model)
         await self.session.flush()
-        await self.session.refresh(model)
-        await self.session.commit()
+        return self._to_entity(model)
+
+    async def upsert_by_user_and_channel_id(self, channel: TelegramChannel) -> TelegramChannel:
+        """Create channel, or return the existing one for the same user and channel ID."""
+        stmt = pg_insert(TelegramChannelModel).values(
+            user_id=channel.user_id,
+            channel_id=channel.channel_id,
+            username=channel.username,
+            title=channel.title
+        ).on_conflict_do_update(
+            constraint="uq_user_channel",
+            # No-op update so RETURNING also yields the existing row
+            set_={"title": TelegramChannelModel.title}
+        ).returning(TelegramChannelModel)
+        result = await self.session.execute(stmt, execution_options={"populate_existing": True})
+        model = result.scalar_one()
         return self._to_entity(model)
 
     async def update(self, channel: TelegramChannel) -> TelegramChannel:
@@ -426,7 +581,6 @@ class ChannelRepositoryImpl(ChannelRepository):
                 title=channel.title
             )
         )
-        await self.session.commit()
         return channel
 
     async def delete(self, channel_id: int) -> bool:
@@ -434,7 +588,6 @@ class ChannelRepositoryImpl(ChannelRepository):
         result = await self.session.execute(
             delete(TelegramChannelModel).where(TelegramChannelModel.id == channel_id)
         )
-        await self.session.commit()
         return result.rowcount > 0
 
     async def exists(self, user_id: UUID, channel_id: int) -> bool:
@@ -450,8 +603,8 @@ class ChannelRepositoryImpl(ChannelRepository):
         return result.scalar_one_or_none() is not None
 
     def _to_entity(self, model: TelegramChannelModel) -> TelegramChannel:
-        """Convert model to entity."""
-        return TelegramChannel(
+        """Convert model to entity (trusted DB row, so skip validation)."""
+        return TelegramChannel.model_construct(
             id=model.id,
             user_id=model.user_id,
             channel_id=model.channel_id,
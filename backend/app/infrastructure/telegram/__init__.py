@@ -1,4 +1,4 @@
 from .client import TelegramClientManager
-from .manager import TelegramManager
+from .manager import HashingReader, TelegramManager
 
-__all__ = ["TelegramClientManager", "TelegramManager"]
+__all__ = ["TelegramClientManager", "TelegramManager", "HashingReader"]
@@ -1,9 +1,11 @@
 """Telegram client management."""
 
 import asyncio
+import itertools
+import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
 
 from pyrogram.client import Client
 
@@ -13,6 +15,9 @@ from ...core.exceptions import TelegramError
 
 logger = get_logger(__name__)
 
+# Idle pooled login clients older than this are replaced rather than handed out
+_LOGIN_CLIENT_MAX_IDLE = 300.0
+
 
 @dataclass
 class TelegramClients:
@@ -35,6 +40,21 @@ class TelegramClientManager:
         self._workdir = backend_dir / ".pyrogram"
         self._workdir.mkdir(parents=True, exist_ok=True)
 
+        # Constructor arguments resolved once, reused whenever a client is (re)created
+        self._bot_kwargs = dict(
+            name="tgdrive-bot",
+            bot_token=self.settings.bot_token,
+            api_id=self.settings.api_id,
+            api_hash=self.settings.api_hash,
+            workdir=str(self._workdir),
+        )
+        self._user_kwargs = dict(
+            name="tgdrive-user",
+            api_id=self.settings.api_id,
+            api_hash=self.settings.api_hash,
+            in_memory=True,  # No local persistence
+        )
+
     async def start(self) -> TelegramClients:
         """Start bot client and return clients container."""
         async with self._lock:
@@ -42,13 +62,7 @@ class TelegramClientManager:
                 try:
                     logger.debug("Starting Telegram bot client...")
                     # Persist bot session on disk to avoid FloodWait due to frequent re-authorization
-                    self._bot = Client(
-                        name="tgdrive-bot",
-                        bot_token=self.settings.bot_token,
-                        api_id=self.settings.api_id,
-                        api_hash=self.settings.api_hash,
-                        workdir=str(self._workdir),
-                    )
+                    self._bot = Client(**self._bot_kwargs)
                     await self._bot.start()
                     logger.info("Telegram bot client started successfully")
                 except Exception as e:
@@ -67,13 +81,7 @@ class TelegramClientManager:
 
             try:
                 logger.debug("Starting Telegram user client...")
-                self._user = Client(
-                    name="tgdrive-user",
-                    api_id=self.settings.api_id,
-                    api_hash=self.settings.api_hash,
-                    session_string=session_string,
-                    in_memory=True,  # No local persistence
-                )
+                self._user = Client(session_string=session_string, **self._user_kwargs)
                 await self._user.start()
                 logger.info("Telegram user client started successfully")
             except Exception as e:
@@ -124,5 +132,86 @@ class TelegramClientManager:
         return self._bot is not None
 
 
-# Global instance
+async def _disconnect_quietly(client: Client) -> None:
+    """Disconnect a pooled login client, logging failures."""
+    try:
+        await client.disconnect()
+    except Exception as e:
+        logger.warning(f"Error disconnecting login client: {e}")
+
+
+class LoginClientPool:
+    """Keep connected, unauthenticated clients ready for phone logins.
+
+    Connecting a fresh client negotiates a new MTProto auth key, which is the
+    slow part of sending a login code; the pool pays that cost in the
+    background instead of on the request. It is filled lazily, after the first
+    checkout, and idle clients that dropped or sat too long are replaced.
+    """
+
+    def __init__(self) -> None:
+        self.settings = get_settings()
+        self._size = self.settings.login_client_pool_size
+        self._idle: asyncio.Queue[Tuple[float, Client]] = asyncio.Queue()
+        self._refill_task: Optional[asyncio.Task] = None
+        self._names = itertools.count()
+        self._client_kwargs = dict(
+            api_id=self.settings.api_id,
+            api_hash=self.settings.api_hash,
+            in_memory=True,
+            no_updates=True,  # Disable updates to avoid unnecessary connections
+        )
+
+    async def _connect(self) -> Client:
+        """Create and connect a client without signing in."""
+        client = Client(name=f"login_{next(self._names)}", **self._client_kwargs)
+        # Connect without starting (to avoid interactive prompts)
+        await client.connect()
+        return client
+
+    async def _refill(self) -> None:
+        """Top the pool back up to its configured size."""
+        while self._idle.qsize() < self._size:
+            try:
+                client = await self._connect()
+                self._idle.put_nowait((time.monotonic(), client))
+            except Exception as e:
+                logger.warning(f"Failed to pre-connect login client: {e}")
+                return
+
+    def _schedule_refill(self) -> None:
+        if self._size > 0 and (self._refill_task is None or self._refill_task.done()):
+            self._refill_task = asyncio.create_task(self._refill())
+
+    async def acquire(self) -> Client:
+        """Take a live idle client, connecting one on the spot if none is left."""
+        client = None
+        while client is None and not self._idle.empty():
+            connected_at, candidate = self._idle.get_nowait()
+            if candidate.is_connected and time.monotonic() - connected_at < _LOGIN_CLIENT_MAX_IDLE:
+                client = candidate
+            else:
+                await _disconnect_quietly(candidate)
+        if client is None:
+            client = await self._connect()
+        self._schedule_refill()
+        return client
+
+    async def stop(self) -> None:
+        """Stop refilling and disconnect idle clients."""
+        if self._refill_task:
+            self._refill_task.cancel()
+            try:
+                await self._refill_task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._refill_task = None
+
+        while not self._idle.empty():
+            _, client = self._idle.get_nowait()
+            await _disconnect_quietly(client)
+
+
+# Global instances
 telegram_client_manager = TelegramClientManager()
+login_client_pool = LoginClientPool()
@@ -1,22 +1,162 @@
 """High-level Telegram operations manager."""
 
+import asyncio
 import hashlib
 import json
 import mimetypes
 import os
-import subprocess
+import shutil
 import tempfile
-from typing import Optional, Tuple, BinaryIO
+from typing import AsyncIterator, Optional, Sequence, Tuple, BinaryIO
 
 from pyrogram.client import Client
+from pyrogram.errors import PeerIdInvalid, ChannelInvalid, ChannelPrivate, UsernameInvalid, UsernameNotOccupied
 from pyrogram.types import Message
 
+try:
+    # Optional: libav bindings probe and grab thumbnails in-process
+    import av
+except ImportError:
+    av = None
+
 from ...config.logging import get_logger
 from ...core.exceptions import TelegramError, StorageError
 from .client import TelegramClientManager
 
 logger = get_logger(__name__)
 
+# Read size for hashing and copying file streams
+CHUNK_SIZE = 1024 * 1024
+
+# Seconds allowed for each ffprobe/ffmpeg run
+MEDIA_TOOL_TIMEOUT = 30
+
+# Position of the frame used as a video thumbnail
+THUMBNAIL_OFFSET_SECONDS = 1
+
+# Failures that mean "this chat identifier can't be resolved", worth retrying
+# with the next identifier; pyrogram raises KeyError/ValueError for peers it
+# has never seen
+_PEER_RESOLUTION_ERRORS = (
+    PeerIdInvalid, ChannelInvalid, ChannelPrivate, UsernameInvalid, UsernameNotOccupied,
+    KeyError, ValueError,
+)
+
+
+async def _stream_media(client: Client, message: Message) -> AsyncIterator[bytes]:
+    """Yield a message's media chunks, ending the stream if Telegram fails mid-way.
+
+    By the time a chunk fails the response headers are sent and the request's
+    dependencies have exited, so there is nobody left to raise to.
+    """
+    try:
+        async for chunk in client.stream_media(message):
+            yield chunk
+    except Exception as e:
+        logger.error(f"Download of message {message.id} aborted mid-stream: {e!r}")
+
+
+def _probe_with_av(video_path: str) -> dict:
+    """Read duration and dimensions of the first video stream with PyAV."""
+    with av.open(video_path) as container:
+        stream = next((s for s in container.streams if s.type == 'video'), None)
+        if stream is None:
+            return {}
+        if container.duration is not None:
+            duration = container.duration / av.time_base
+        elif stream.duration is not None and stream.time_base is not None:
+            duration = float(stream.duration * stream.time_base)
+        else:
+            duration = 0
+        return {
+            'duration': int(duration),
+            'width': stream.codec_context.width,
+            'height': stream.codec_context.height,
+        }
+
+
+def _thumbnail_with_av(video_path: str, thumb_path: str) -> bool:
+    """Write the frame at THUMBNAIL_OFFSET_SECONDS (or the last one before it) as a JPEG."""
+    with av.open(video_path) as container:
+        stream = next((s for s in container.streams if s.type == 'video'), None)
+        if stream is None:
+            return False
+        # Seeks to the keyframe at or before the offset, then decodes forward
+        container.seek(THUMBNAIL_OFFSET_SECONDS * av.time_base)
+        frame = None
+        for decoded in container.decode(stream):
+            frame = decoded
+            if decoded.time is not None and decoded.time >= THUMBNAIL_OFFSET_SECONDS:
+                break
+        if frame is None:
+            return False
+
+    with av.open(thumb_path, 'w', format='image2') as output:
+        encoder = output.add_stream('mjpeg')
+        encoder.width, encoder.height = frame.width, frame.height
+        encoder.pix_fmt = 'yuvj420p'
+        image = frame.reformat(format='yuvj420p')
+        image.pts = None
+        for packet in encoder.encode(image):
+            output.mux(packet)
+        for packet in encoder.encode():
+            output.mux(packet)
+    return True
+
+
+async def _run_media_tool(cmd: Sequence[str]) -> Tuple[int, bytes, bytes]:
+    """Run ffprobe/ffmpeg without blocking the event loop; kill it on timeout."""
+    proc = await asyncio.create_subprocess_exec(
+        *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(proc.communicate(), MEDIA_TOOL_TIMEOUT)
+    except BaseException:
+        if proc.returncode is None:
+            proc.kill()
+            await proc.wait()
+        raise
+    return proc.returncode, stdout, stderr
+
+
+def _stage_to_tempfile(file_data: BinaryIO, filename: str) -> str:
+    """Stream file data into a named temporary file and return its path."""
+    with tempfile.NamedTemporaryFile(delete=False, suffix=f"_{filename}") as temp_file:
+        try:
+            file_data.seek(0)
+            shutil.copyfileobj(file_data, temp_file, CHUNK_SIZE)
+        except BaseException:
+            os.remove(temp_file.name)
+            raise
+        return temp_file.name
+
+
+class HashingReader:
+    """Read-only file wrapper that SHA-256 hashes the bytes read through it.
+
+    Lets an upload compute its checksum in the same pass that stages the
+    file, instead of reading it once more up front. Seeking back to the
+    start resets the digest.
+    """
+
+    def __init__(self, raw: BinaryIO):
+        self._raw = raw
+        self._hash = hashlib.sha256()
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._raw.read(size)
+        self._hash.update(data)
+        return data
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        position = self._raw.seek(offset, whence)
+        if position == 0:
+            self._hash = hashlib.sha256()
+        return position
+
+    def hexdigest(self) -> str:
+        return self._hash.hexdigest()
+
 
 class TelegramManager:
     """High-level Telegram operations manager."""
@@ -49,11 +189,8 @@ class TelegramManager:
             is_video = mime_type and mime_type.startswith('video/')
             is_audio = mime_type and mime_type.startswith('audio/')
             
-            # Save to temporary file
-            with tempfile.NamedTemporaryFile(delete=False, suffix=f"_{filename}") as temp_file:
-                temp_path = temp_file.name
-                file_data.seek(0)
-                temp_file.write(file_data.read())
+            # Save to temporary file (blocking disk I/O, so off the event loop)
+            temp_path = await asyncio.to_thread(_stage_to_tempfile, file_data, filename)
             
             try:
                 if is_image:
@@ -63,9 +200,11 @@ class TelegramManager:
                         caption=caption
                     )
                 elif is_video:
-                    # Extract video metadata for better preview
-                    video_meta = self._extract_video_metadata(temp_path)
-                    thumb_path = self._generate_video_thumbnail(temp_path)
+                    # Extract video metadata for better preview (both probes run concurrently)
+                    video_meta, thumb_path = await asyncio.gather(
+                        self._extract_video_metadata(temp_path),
+                        self._generate_video_thumbnail(temp_path),
+                    )
                     
                     try:
                         video_kwargs = {
@@ -120,13 +259,17 @@ class TelegramManager:
         except Exception as e:
             raise StorageError(f"Failed to upload file: {e}")
     
-    async def download_file(
+    async def iter_download(
         self,
-        channel_id: int | str,
+        identifiers: Sequence[int | str],
         message_id: int,
         use_user_client: bool = False
-    ) -> bytes:
-        """Download file from Telegram."""
+    ) -> AsyncIterator[bytes]:
+        """Resolve a file message and return an iterator over its content chunks.
+
+        Identifiers for the same channel (e.g. username, then numeric ID) are
+        tried in order, moving on only when the chat itself can't be resolved.
+        """
         try:
             clients = await self.client_manager.start()
             client = clients.user if use_user_client and clients.user else clients.bot
@@ -134,44 +277,33 @@ class TelegramManager:
             if not client:
                 raise TelegramError("No available client for download")
 
-            # DEBUG level: Download preparation details
-            logger.debug(f"Telegram download starting - Channel: {channel_id}, Message: {message_id}, Client: {'user' if use_user_client else 'bot'}")
+            message = None
+            for channel_id in identifiers:
+                # DEBUG level: Download preparation details
+                logger.debug(f"Telegram download starting - Channel: {channel_id}, Message: {message_id}, Client: {'user' if use_user_client else 'bot'}")
+
+                # Get message
+                try:
+                    message = await client.get_messages(chat_id=channel_id, message_ids=message_id)
+                    break
+                except _PEER_RESOLUTION_ERRORS as e:
+                    logger.warning(f"Cannot resolve channel {channel_id}, trying next identifier: {e!r}")
+            else:
+                raise StorageError(f"No usable channel identifier among {list(identifiers)}")
 
-            # Get message
-            message = await client.get_messages(chat_id=channel_id, message_ids=message_id)
             if isinstance(message, list):
                 message = message[0]
 
-            # Download media to temporary file first, then read
-            import tempfile
-            import os
-
-            with tempfile.NamedTemporaryFile(delete=False) as temp_file:
-                temp_path = temp_file.name
-
-            try:
-                # Download to temporary file
-                downloaded_path = await client.download_media(message, file_name=temp_path)
-
-                # Read file content
-                with open(downloaded_path, 'rb') as f:
-                    file_data = f.read()
-
-                # DEBUG level: Download success details
-                logger.debug(f"Telegram download completed - Size: {len(file_data)} bytes")
-
-                return file_data
-
-            finally:
-                # Clean up temporary file
-                try:
-                    if os.path.exists(temp_path):
-                        os.remove(temp_path)
-                except Exception:
-                    pass
+            if not message or not message.media:
+                raise StorageError("Message has no downloadable media")
 
+        except StorageError:
+            raise
         except Exception as e:
             raise StorageError(f"Failed to download file: {e}")
+
+        # Chunks are fetched from Telegram as the response is consumed
+        return _stream_media(client, message)
     
     async def get_chat_info(self, chat_id: int | str) -> dict:
         """Get chat information."""
@@ -189,29 +321,47 @@ class TelegramManager:
             raise TelegramError(f"Failed to get chat info: {e}")
     
     def calculate_file_checksum(self, file_data: BinaryIO) -> str:
-        """Calculate SHA256 checksum of file."""
+        """Calculate SHA256 checksum of file.
+
+        SHA-256 is the dedup key stored in nodes.checksum (String(64)); changing
+        the algorithm would orphan every existing checksum from dedup lookups.
+        """
         file_data.seek(0)
-        hash_sha256 = hashlib.sha256()
-        for chunk in iter(lambda: file_data.read(4096), b""):
-            hash_sha256.update(chunk)
+        try:
+            # Read/update loop runs in C with the GIL released; OpenSSL's
+            # sha256 uses SHA-NI where available
+            hash_sha256 = hashlib.file_digest(file_data, "sha256")
+        except (AttributeError, ValueError):
+            # Python < 3.11, or a stream without readable()/readinto()
+            file_data.seek(0)
+            hash_sha256 = hashlib.sha256()
+            buffer = bytearray(CHUNK_SIZE)
+            view = memoryview(buffer)
+            while size := file_data.readinto(buffer):
+                hash_sha256.update(view[:size])
         file_data.seek(0)
         return hash_sha256.hexdigest()
     
-    def _extract_video_metadata(self, video_path: str) -> dict:
-        """Extract video metadata using ffprobe."""
+    async def _extract_video_metadata(self, video_path: str) -> dict:
+        """Extract video metadata using PyAV if installed, else ffprobe."""
+        if av is not None:
+            try:
+                return await asyncio.to_thread(_probe_with_av, video_path)
+            except Exception as e:
+                logger.debug(f"PyAV probe failed, falling back to ffprobe: {e}")
         try:
             cmd = [
                 'ffprobe', '-v', 'quiet', '-print_format', 'json', 
                 '-show_format', '-show_streams', video_path
             ]
-            result = subprocess.run(cmd, capture_output=True, timeout=30)
-            if result.returncode != 0:
-                stderr_text = result.stderr.decode('utf-8', errors='ignore')
+            returncode, stdout, stderr = await _run_media_tool(cmd)
+            if returncode != 0:
+                stderr_text = stderr.decode('utf-8', errors='ignore')
                 logger.debug(f"ffprobe failed: {stderr_text}")
                 return {}
 
             # Decode stdout as UTF-8 to avoid encoding issues
-            stdout_text = result.stdout.decode('utf-8', errors='ignore')
+            stdout_text = stdout.decode('utf-8', errors='ignore')
             if not stdout_text.strip():
                 logger.debug("ffprobe returned empty output")
                 return {}
@@ -242,19 +392,25 @@ class TelegramManager:
             logger.debug(f"Video metadata extraction failed: {e}")
             return {}
     
-    def _generate_video_thumbnail(self, video_path: str) -> Optional[str]:
-        """Generate video thumbnail using ffmpeg."""
+    async def _generate_video_thumbnail(self, video_path: str) -> Optional[str]:
+        """Generate video thumbnail using PyAV if installed, else ffmpeg."""
+        thumb_path = video_path + "_thumb.jpg"
+        if av is not None:
+            try:
+                if await asyncio.to_thread(_thumbnail_with_av, video_path, thumb_path):
+                    return thumb_path
+            except Exception as e:
+                logger.debug(f"PyAV thumbnail failed, falling back to ffmpeg: {e}")
         try:
-            thumb_path = video_path + "_thumb.jpg"
             cmd = [
-                'ffmpeg', '-i', video_path, '-ss', '00:00:01', '-vframes', '1', 
+                'ffmpeg', '-i', video_path, '-ss', f'00:00:{THUMBNAIL_OFFSET_SECONDS:02d}', '-vframes', '1', 
                 '-f', 'image2', '-y', thumb_path
             ]
-            result = subprocess.run(cmd, capture_output=True, timeout=30)
-            if result.returncode == 0 and os.path.exists(thumb_path):
+            returncode, _, stderr = await _run_media_tool(cmd)
+            if returncode == 0 and os.path.exists(thumb_path):
                 return thumb_path
             else:
-                stderr_text = result.stderr.decode('utf-8', errors='ignore') if result.stderr else 'Unknown error'
+                stderr_text = stderr.decode('utf-8', errors='ignore') if stderr else 'Unknown error'
                 logger.debug(f"Thumbnail generation failed: {stderr_text}")
                 return None
         except Exception as e:
@@ -1,5 +1,9 @@
 """Modern Telegram Drive Backend - Main Application."""
 
+import asyncio
+import os
+import ssl
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
@@ -9,6 +13,8 @@ from .config import get_settings, get_database
 from .config.logging import setup_logging, get_logger
 from .presentation.api.v1 import auth, files
 from .core.exceptions import TelegramDriveException
+from .core.telegram_state import telegram_state_manager
+from .infrastructure.telegram.client import login_client_pool
 from .presentation.middleware.exception_handler import add_exception_handlers
 from .presentation.middleware.request_logging import add_request_logging_middleware
 
@@ -24,6 +30,13 @@ async def lifespan(app: FastAPI):
     logger.info("Starting Telegram Drive Backend v2.0")
     settings = get_settings()
     logger.info(f"Log level set to: {settings.log_level}")
+    # Checksums go through OpenSSL's SHA-256; make the build visible
+    logger.info(f"Using {ssl.OPENSSL_VERSION}")
+
+    # Password hashing runs in the default executor; size the pool for it
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=(os.cpu_count() or 1) * 2)
+    )
 
     db_manager = get_database()
     db_manager.initialize(settings.database_url)
@@ -33,6 +46,8 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     logger.info("Shutting down application")
+    await login_client_pool.stop()
+    await telegram_state_manager.cleanup_all()
     await db_manager.close()
     logger.info("Database connections closed")
 
@@ -41,7 +56,8 @@ def create_app() -> FastAPI:
     """Create and configure FastAPI application."""
     settings = get_settings()
 
-    # Enable docs in development (when log level is DEBUG)
+    # Enable docs in development (when log level is DEBUG); the OpenAPI schema
+    # (with all field descriptions) is only generated and served alongside them
     enable_docs = settings.log_level == "DEBUG"
 
     app = FastAPI(
@@ -51,6 +67,7 @@ def create_app() -> FastAPI:
         lifespan=lifespan,
         docs_url="/docs" if enable_docs else None,
         redoc_url="/redoc" if enable_docs else None,
+        openapi_url="/openapi.json" if enable_docs else None,
     )
     
     # CORS middleware
@@ -47,7 +47,7 @@ class AdminUseCases:
         if user.status == UserStatus.ACTIVE:
             raise ValidationError("User is already active")
         
-        user.status = UserStatus.ACTIVE
+        user = user.model_copy(update={"status": UserStatus.ACTIVE})
         await self.user_repository.update(user)
         return user
     
@@ -63,7 +63,7 @@ class AdminUseCases:
         if user.status == UserStatus.INACTIVE:
             raise ValidationError("User is already inactive")
         
-        user.status = UserStatus.INACTIVE
+        user = user.model_copy(update={"status": UserStatus.INACTIVE})
         await self.user_repository.update(user)
         return user
     
@@ -5,6 +5,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ....application.schemas.common import SuccessResponse
+from ....application.schemas.channel import ChannelListResponse
 from ....application.use_cases import ChannelUseCases
 from ....infrastructure.database.repositories import UserRepositoryImpl, ChannelRepositoryImpl
 from ....infrastructure.telegram.client import telegram_client_manager
@@ -45,14 +46,14 @@ async def ensure_storage_channel(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/")
+@router.get("/", response_model=ChannelListResponse)
 async def list_channels(
     channel_use_cases: ChannelUseCases = Depends(get_channel_use_cases)
 ):
     """List all channels for current user."""
     try:
         channels = await channel_use_cases.list_channels()
-        return {"channels": channels}
+        return ChannelListResponse(channels=channels)
     except TelegramError as e:
         raise HTTPException(status_code=500, detail=str(e))
 
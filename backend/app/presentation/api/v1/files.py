@@ -1,6 +1,7 @@
 """File management API routes."""
 
-import io
+from uuid import UUID
+
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query
 from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -98,14 +99,14 @@ async def upload_file(
 
 @router.get("/id/{file_id}/download")
 async def download_file(
-    file_id: str,
+    file_id: UUID,
     file_use_cases: FileUseCases = Depends(get_file_use_cases)
 ):
     """Download file by ID."""
     try:
-        file_data, filename = await file_use_cases.download_file(file_id)
+        chunks, filename, file_size = await file_use_cases.download_file(file_id)
         # DEBUG level: Download API response details
-        logger.debug(f"Download API response - File: {filename}, Size: {len(file_data)} bytes")
+        logger.debug(f"Download API response - File: {filename}, Size: {file_size} bytes")
 
         # Build RFC 5987 compatible header
         from urllib.parse import quote
@@ -116,11 +117,8 @@ async def download_file(
             "Content-Disposition": f"attachment; filename=\"{ascii_fallback}\"; filename*=UTF-8''{filename_star}"
         }
 
-        def generate():
-            yield file_data
-
         return StreamingResponse(
-            generate(),
+            chunks,
             media_type="application/octet-stream",
             headers=headers
         )
@@ -134,7 +132,7 @@ async def download_file(
 
 @router.post("/id/{file_id}/move", response_model=MoveResponse)
 async def move_file(
-    file_id: str,
+    file_id: UUID,
     request: MoveRequest,
     file_use_cases: FileUseCases = Depends(get_file_use_cases)
 ):
@@ -148,6 +146,8 @@ async def move_file(
         return MoveResponse(**result)
     except NotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
+    except ConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except ValidationError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except StorageError as e:
@@ -156,7 +156,7 @@ async def move_file(
 
 @router.delete("/id/{file_id}", response_model=DeleteResponse)
 async def delete_file(
-    file_id: str,
+    file_id: UUID,
     file_use_cases: FileUseCases = Depends(get_file_use_cases)
 ):
     """Delete file by ID."""